@@ -3,14 +3,18 @@ Extended Attendance Application with Camera Functionality
 Inherits from the base FaceRecognitionApp and adds camera-specific features
 """
 
-import cv2
-import numpy as np
-import face_recognition
 import threading
 import time
 from datetime import datetime
 from .main import FaceRecognitionApp
-from PIL import Image
+from .recognition.ann_index import ANN_INDEX_FILENAME
+from .recognition.engine import FrameJob
+from .recognition.pipeline import RecognitionPipeline
+from .recognition.settings import RecognitionSettings
+from .recognition.shm_workers import ProcessRecognitionPool
+from .services.attendance_session import UNKNOWN, AttendanceSession
+from .ui.bridge import UIBridge
+from .ui.renderer import GREEN, RED, Annotation
 
 class AttendanceApp(FaceRecognitionApp):
     """Extended Attendance App with Camera and Face Recognition"""
@@ -21,143 +25,290 @@ class AttendanceApp(FaceRecognitionApp):
     
     def setup_attendance_features(self):
         """Setup attendance-specific features"""
-        # Attendance tracking
-        self.last_detection_time = {}  # Track last detection per student
-        self.detection_cooldown = 3  # 3 seconds between detections
+        # Recognition tuning, shared with the kiosk daemon
+        self.settings = RecognitionSettings()
         
-        # Camera frame processing
-        self.frame_skip = 0
-        self.max_frame_skip = 2  # Process every 3rd frame for performance
+        # Attendance marking with a cooldown per student; events are tagged
+        # with the camera that saw them
+        self.session = AttendanceSession(self.attendance_log, cooldown=self.settings.detection_cooldown)
+        self.present_students = self.session.present_students
+        self.attendance_events = self.session.events
+        
+        # Face matching against the gallery, per student
+        self.matcher = self.settings.build_matcher(self.gallery, index_path=self.students_dir / ANN_INDEX_FILENAME)
+        
+        # Camera frame processing; the tracker follows faces between detections
+        # and keeps recognized identities, re-encoding them periodically.
+        # A student is only accepted once K of the last M encodings agree
+        self.use_tracker = True
+        self.tracker = self.settings.build_tracker() if self.use_tracker else None
+        
+        # Motion gate idles the detector while the scene is empty and static
+        self.use_motion_gate = True
+        self.motion_gate = self.settings.build_motion_gate() if self.use_motion_gate else None
+        
+        # While faces are tracked, detection searches windows around them,
+        # with a full-frame sweep every second for newcomers
+        self.engine = self.settings.build_engine(self.matcher, self.tracker, self.motion_gate)
+        self.max_frame_skip = self.settings.frame_skip
+        
+        # Adaptive controller tunes frame skip, detection scale and upsampling
+        # to keep capture-to-result latency within budget
+        self.use_adaptive_control = True
+        self.controller = self.settings.build_controller(self.engine) if self.use_adaptive_control else None
+        
+        # Staged pipeline: capture → detect → encode → match → attendance/render
+        self.use_pipeline = True
+        self.pipeline = None
+        
+        # Optional process mode: detection and encoding in worker processes
+        # reading frames from a shared-memory ring (processes every frame,
+        # first camera only)
+        self.use_process_workers = False
+        self.process_workers = None  # None uses all but one CPU core
+        self.process_pool = None
+        
+        # Recognition threads never touch Tk: they publish frames and UI updates
+        # to the bridge, which the Tk loop drains at the display rate
+        self.display_fps = 30
+        self.ui_bridge = UIBridge(self.root, self.camera_panel.update_frame, fps=self.display_fps)
+        self.ui_bridge.start()
+        
+        # While the preview is hidden, recognition runs without building
+        # overlays, colour conversion or image work
+        self.render_enabled = True
         
         print("✅ Attendance features initialized")
     
     def update_frame(self):
         """Update camera frame with face recognition"""
-        while self.running and self.cap and self.cap.isOpened():
+        cameras = self.cameras
+        if not cameras:
+            return
+        multi_camera = len(cameras) > 1
+        if self.use_process_workers and not multi_camera:
+            self.run_process_workers()
+            return
+        if self.use_pipeline or multi_camera:
+            # Several cameras always share the pipeline's workers
+            self.run_pipeline(cameras)
+            return
+        
+        camera = cameras.primary
+        grabber = camera.grabber
+        last_seq = 0
+        while self.running and grabber and grabber.running:
             try:
-                ret, frame = self.cap.read()
-                if not ret:
+                # Wait for the freshest frame from the capture thread
+                captured = grabber.read(after_seq=last_seq)
+                if captured is None:
                     continue
+                last_seq = captured.seq
                 
-                # Skip frames for performance
-                self.frame_skip += 1
-                if self.frame_skip < self.max_frame_skip:
+                if self.skip_frame(camera):
                     continue
-                self.frame_skip = 0
-                
-                # Resize frame for faster processing
-                small_frame = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
-                rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
-                
-                # Find faces in frame
-                face_locations = face_recognition.face_locations(rgb_small_frame)
-                face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
                 
-                # Process each face found
-                for (top, right, bottom, left), face_encoding in zip(face_locations, face_encodings):
-                    # Scale back to original size
-                    top *= 4
-                    right *= 4
-                    bottom *= 4
-                    left *= 4
-                    
-                    # Check if face matches known students
-                    matches = face_recognition.compare_faces(self.encode_list_known, face_encoding, tolerance=0.6)
-                    face_distance = face_recognition.face_distance(self.encode_list_known, face_encoding)
-                    
-                    if True in matches:
-                        best_match_index = np.argmin(face_distance)
-                        if matches[best_match_index]:
-                            name = self.student_names[best_match_index]
-                            self.process_student_detection(name, frame, (top, right, bottom, left))
-                    else:
-                        self.process_unknown_face(frame, (top, right, bottom, left))
-                
-                # Update camera panel
-                self.update_camera_display(frame)
-                
-                # Small delay to prevent excessive CPU usage
-                time.sleep(0.03)  # ~30 FPS
+                # Detect, encode and match faces on this thread
+                job = self.engine.process(FrameJob.from_capture(captured, camera.name))
+                if job is not None:
+                    self.handle_recognition(job)
                 
             except Exception as e:
                 print(f"❌ Frame processing error: {e}")
                 time.sleep(0.1)
     
-    def process_student_detection(self, name, frame, bbox):
-        """Process detected student face"""
-        top, right, bottom, left = bbox
-        current_time = time.time()
-        
-        # Check cooldown
-        if name in self.last_detection_time:
-            if current_time - self.last_detection_time[name] < self.detection_cooldown:
-                return
+    def run_pipeline(self, cameras):
+        """Feed frames from every camera through one staged recognition pipeline"""
+        self.pipeline = RecognitionPipeline(
+            self.settings.pipeline_stages(self.engine),
+            sink=self.handle_recognition,
+            queue_size=self.settings.pipeline_queue_size,
+            sink_name="attendance",
+        )
+        self.pipeline.start()
+        print(f"✅ Recognition pipeline started ({self.settings.pipeline_workers}, {len(cameras)} camera(s))")
         
-        # Update last detection time
-        self.last_detection_time[name] = current_time
+        feeders = [
+            threading.Thread(target=self.feed_camera, args=(camera,), name=f"feed-{camera.name}", daemon=True)
+            for camera in list(cameras)[1:]
+        ]
+        for feeder in feeders:
+            feeder.start()
+        try:
+            self.feed_camera(cameras.primary)
+        finally:
+            for feeder in feeders:
+                feeder.join(1.0)
+            self.pipeline.stop()
+    
+    def feed_camera(self, camera):
+        """Submit one camera's frames to the shared pipeline, tagged with its name"""
+        grabber = camera.grabber
+        last_seq = 0
+        while self.running and grabber and grabber.running:
+            captured = grabber.read(after_seq=last_seq)
+            if captured is None:
+                continue
+            last_seq = captured.seq
+            if not self.skip_frame(camera):
+                self.pipeline.submit(FrameJob.from_capture(captured, camera.name))
+    
+    def run_process_workers(self):
+        """Feed every captured frame to the worker processes through shared memory"""
+        grabber = self.grabber
+        captured = None
+        while self.running and grabber and grabber.running and captured is None:
+            captured = grabber.read()
+        if captured is None:
+            return
         
-        # Mark attendance
-        if self.mark_attendance(name):
-            # Add to present students
-            self.present_students.add(name)
-            
-            # Update student card
-            self.students_panel.update_student_card(name, True)
-            
-            # Update stats
-            self.control_panel.update_stats(
-                total_students=len(self.student_data),
-                marked_present=len(self.present_students),
-                unknown_detected=self.unknown_count
-            )
-            
-            print(f"✅ Student detected: {name}")
+        self.process_pool = ProcessRecognitionPool(
+            workers=self.process_workers, scale=self.engine.scale, upsample=self.engine.upsample,
+            detector=self.settings.detector_backend, prefilter=self.settings.detector_prefilter,
+        )
+        self.process_pool.start(captured.image.shape)
+        # The collector lives exactly as long as this pool, not as long as the camera
+        collector_stop = threading.Event()
+        collector = threading.Thread(target=self.collect_process_results, args=(self.process_pool, collector_stop),
+                                     daemon=True)
+        collector.start()
         
-        # Draw bounding box
-        cv2.rectangle(frame, (left, top), (right, bottom), (0, 255, 0), 2)
-        cv2.putText(frame, name, (left, top - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+        try:
+            while self.running and grabber.running:
+                self.process_pool.submit(captured.seq, captured.timestamp, captured.image)
+                next_frame = None
+                while self.running and grabber.running and next_frame is None:
+                    next_frame = grabber.read(after_seq=captured.seq)
+                captured = next_frame
+        finally:
+            collector_stop.set()
+            collector.join()
+            self.process_pool.stop()
     
-    def process_unknown_face(self, frame, bbox):
-        """Process unknown face detection"""
-        top, right, bottom, left = bbox
-        current_time = time.time()
+    def collect_process_results(self, pool, stop):
+        """Match and handle frames finished by the worker processes, in capture order, until `stop` is set"""
+        last_seq = 0
+        while not stop.is_set():
+            try:
+                job = pool.collect()
+                if job is None or job.seq <= last_seq:
+                    continue
+                last_seq = job.seq
+                job.source = self.cameras.primary.name if self.cameras else None
+                # Vote per track like the other modes, not from a single frame
+                self.handle_recognition(self.engine.match(self.engine.associate(job)))
+            except Exception as e:
+                print(f"❌ Frame processing error: {e}")
+    
+    def get_pipeline_stats(self):
+        """Get queue depth and latency for each pipeline stage"""
+        if self.process_pool:
+            return self.process_pool.get_stats()
+        if not self.pipeline:
+            return {}
+        return self.pipeline.get_stats()
+    
+    def skip_frame(self, camera):
+        """Apply the frame skip interval to a camera, returning True when this frame should be skipped"""
+        camera.skip_count += 1
+        if camera.skip_count < self.max_frame_skip:
+            return True
+        camera.skip_count = 0
+        return False
+    
+    def set_detector_backend(self, backend, prefilter=None):
+        """Switch the face detector backend and prefilter
+
+        Takes effect on the next detection in thread and pipeline modes; a
+        running process pool keeps its workers' detector until the camera is
+        restarted.
+        """
+        self.settings.detector_backend = backend
+        self.settings.detector_prefilter = prefilter
+        self.engine.detector = self.settings.build_detector()
+        print(f"✅ Detector backend set to {self.engine.detector.name}")
+        if self.process_pool:
+            print("⚠️  Process workers switch detector on the next camera start")
+    
+    def apply_controller_settings(self):
+        """Push the adaptive controller's current settings to the recognition loop"""
+        self.max_frame_skip = self.controller.frame_skip
+        self.engine.scale = self.controller.scale
+        self.engine.upsample = self.controller.upsample
+        if self.process_pool:
+            self.process_pool.scale = self.controller.scale
+            self.process_pool.upsample = self.controller.upsample
+    
+    def get_controller_metrics(self):
+        """Get the adaptive controller's settings and measurements"""
+        if not self.controller:
+            return {}
+        return self.controller.get_metrics()
+    
+    def get_engine_stats(self):
+        """Get tracker and motion gate statistics (e.g. detection skip ratio)"""
+        return self.engine.get_stats()
+    
+    def handle_recognition(self, job):
+        """Mark attendance for recognized faces and display the frame"""
+        if self.controller and self.controller.observe(job.timings, time.time() - job.timestamp):
+            self.apply_controller_settings()
         
-        # Check cooldown for unknown faces
-        if 'unknown' in self.last_detection_time:
-            if current_time - self.last_detection_time['unknown'] < self.detection_cooldown:
-                return
+        cameras = self.cameras
+        if cameras:
+            cameras.record(job.source, job.timestamp, len(job.faces))
         
-        # Update last detection time
-        self.last_detection_time['unknown'] = current_time
+        for bbox, name, distance, accepted, confidence in job.faces:
+            outcome = self.session.observe(name, accepted, job.source, confidence)
+            if outcome == "present":
+                self.ui_bridge.post(self.students_panel.update_student_card, name, True)
+            if outcome:
+                self.post_stats()
         
-        # Increment unknown count
-        self.unknown_count += 1
+        # Recognition-only output while the preview is hidden
+        if not self.render_enabled:
+            return
         
-        # Update stats
-        self.control_panel.update_stats(
+        # Only the first camera is shown in the preview
+        if cameras and cameras.primary and job.source != cameras.primary.name:
+            return
+        self.update_camera_display(job.frame, self.annotate(job.faces))
+    
+    def annotate(self, faces):
+        """Build the overlays for a frame's faces; drawn at display size when presented"""
+        return [
+            Annotation(bbox, name, GREEN) if accepted else Annotation(bbox, UNKNOWN, RED)
+            for bbox, name, distance, accepted, confidence in faces
+        ]
+    
+    def post_stats(self):
+        """Queue a control panel stats refresh for the Tk thread"""
+        self.ui_bridge.post(
+            self.control_panel.update_stats,
             total_students=len(self.student_data),
             marked_present=len(self.present_students),
-            unknown_detected=self.unknown_count
+            unknown_detected=self.session.unknown_count
         )
-        
-        # Draw bounding box for unknown face
-        cv2.rectangle(frame, (left, top), (right, bottom), (0, 0, 255), 2)
-        cv2.putText(frame, "UNKNOWN", (left, top - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
-        
-        print(f"❓ Unknown face detected (total: {self.unknown_count})")
     
-    def update_camera_display(self, frame):
-        """Update camera panel display"""
-        try:
-            # Convert frame to PIL Image
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            pil_image = Image.fromarray(frame_rgb)
-            
-            # Update camera panel
-            self.camera_panel.update_frame(pil_image)
-            
-        except Exception as e:
-            print(f"❌ Camera display update error: {e}")
+    def update_camera_display(self, frame, annotations=()):
+        """Publish a BGR frame and its overlays for the camera panel; shown at the next display tick unless replaced"""
+        self.ui_bridge.publish_frame(frame, annotations)
+    
+    def hide_camera(self):
+        """Hide the preview and stop rendering; recognition and attendance keep running"""
+        self.render_enabled = False
+        self.ui_bridge.discard_frame()
+        self.camera_panel.hide_camera_feed()
+        print("🙈 Camera preview hidden (recognition only)")
+    
+    def show_camera(self):
+        """Show the preview and resume rendering"""
+        self.camera_panel.show_camera_feed()
+        self.render_enabled = True
+    
+    def get_display_stats(self):
+        """Get frames published by recognition versus shown on screen"""
+        return self.ui_bridge.get_stats()
     
     def start_camera(self):
         """Start camera with attendance features"""
@@ -177,9 +328,9 @@ class AttendanceApp(FaceRecognitionApp):
         super().stop_camera()
         
         # Reset attendance state
-        self.present_students.clear()
-        self.unknown_count = 0
-        self.last_detection_time.clear()
+        self.engine.reset()
+        self.session.reset()
+        self.ui_bridge.clear()
         
         # Update UI
         self.students_panel.clear_all_cards()
@@ -187,13 +338,18 @@ class AttendanceApp(FaceRecognitionApp):
         
         print("✅ Attendance camera stopped")
     
+    def cleanup(self):
+        """Stop the UI bridge before the Tk loop exits"""
+        self.ui_bridge.stop()
+        super().cleanup()
+    
     def get_attendance_summary(self):
         """Get current attendance summary"""
         return {
             'total_students': len(self.student_data),
             'present': len(self.present_students),
             'absent': len(self.student_data) - len(self.present_students),
-            'unknown_detected': self.unknown_count,
+            'unknown_detected': self.session.unknown_count,
             'present_students': list(self.present_students)
         }
     
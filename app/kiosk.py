@@ -0,0 +1,168 @@
+"""
+Kiosk Daemon
+Runs the capture-recognize-mark loop without any GUI, reporting status through a JSON file
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .recognition.ann_index import ANN_INDEX_FILENAME
+from .recognition.encoding_cache import CACHE_FILENAME, EncodingCache
+from .recognition.engine import FrameJob
+from .recognition.enrollment import enroll_gallery
+from .recognition.multicam import CameraManager
+from .recognition.pipeline import RecognitionPipeline
+from .recognition.settings import RecognitionSettings
+from .services.attendance_log import AttendanceLog
+from .services.attendance_session import AttendanceSession
+
+
+class KioskDaemon:
+    """Headless attendance station for units without a display
+
+    Uses the same RecognitionSettings and AttendanceSession as the GUI app
+    (the detector backend and prefilter can be overridden) but never imports
+    Tk, customtkinter or PIL, and never renders frames. Progress is written
+    to `status_path` every `status_interval` seconds.
+    """
+
+    def __init__(self, camera_sources=(0,), status_path=None, status_interval: float = 2.0,
+                 enrollment_workers=None, detector_backend: str = "hog", detector_prefilter=None):
+        self.app_dir = Path(__file__).parent.absolute()
+        self.students_dir = self.app_dir / "Images" / "Students"
+        self.students_json_path = self.students_dir / "students.json"
+        self.attendance_log = AttendanceLog(self.app_dir / "attendance.csv")
+        self.status_path = Path(status_path) if status_path else self.app_dir / "kiosk_status.json"
+        self.status_interval = status_interval
+        self.camera_sources = list(camera_sources)
+        self.enrollment_workers = enrollment_workers
+        self.settings = RecognitionSettings(detector_backend=detector_backend, detector_prefilter=detector_prefilter)
+
+        # Attendance tracking, keeping the latest events for the status file
+        self.session = AttendanceSession(self.attendance_log, cooldown=self.settings.detection_cooldown,
+                                         max_events=20)
+        self.max_frame_skip = self.settings.frame_skip
+
+        self.running = False
+        self.started_at = None
+        self.cameras = None
+        self.pipeline = None
+        self._stop_event = threading.Event()
+
+    def setup(self):
+        """Load students and the gallery, and build the recognition engine"""
+        self.student_data = {}
+        if self.students_json_path.exists():
+            with open(self.students_json_path, 'r') as f:
+                self.student_data = {student['name']: student for student in json.load(f)}
+        self.attendance_log.prepare()
+
+        cache = EncodingCache(self.students_dir / CACHE_FILENAME, root_dir=self.students_dir)
+        self.gallery = enroll_gallery(self.students_dir, cache=cache, workers=self.enrollment_workers)
+        print(f"✅ Loaded {len(self.gallery)} encodings for {self.gallery.num_students} students")
+
+        self.matcher = self.settings.build_matcher(self.gallery, index_path=self.students_dir / ANN_INDEX_FILENAME)
+        self.engine = self.settings.build_engine(self.matcher, self.settings.build_tracker(),
+                                                 self.settings.build_motion_gate())
+        self.controller = self.settings.build_controller(self.engine)
+
+    def run(self):
+        """Run until stop() is called, writing the status file periodically"""
+        self.setup()
+        self.cameras = CameraManager(self.camera_sources)
+        if not self.cameras.open():
+            print("❌ Failed to open any camera")
+            self.cameras = None
+            return False
+
+        self.pipeline = RecognitionPipeline(
+            self.settings.pipeline_stages(self.engine),
+            sink=self.handle_recognition,
+            queue_size=self.settings.pipeline_queue_size,
+            sink_name="attendance",
+        )
+        self.running = True
+        self.started_at = time.time()
+        self.pipeline.start()
+        feeders = [threading.Thread(target=self.feed_camera, args=(camera,), name=f"feed-{camera.name}",
+                                    daemon=True) for camera in self.cameras]
+        for feeder in feeders:
+            feeder.start()
+        print(f"✅ Kiosk running with {len(self.cameras)} camera(s), status in {self.status_path}")
+
+        try:
+            while not self._stop_event.wait(self.status_interval):
+                self.write_status()
+        finally:
+            self.running = False
+            for feeder in feeders:
+                feeder.join(1.0)
+            self.pipeline.stop()
+            self.cameras.stop()
+            self.write_status(state="stopped")
+            print("✅ Kiosk stopped")
+        return True
+
+    def stop(self):
+        """Ask the run loop to finish (safe to call from signal handlers)"""
+        self._stop_event.set()
+
+    def feed_camera(self, camera):
+        """Submit one camera's frames to the shared pipeline"""
+        grabber = camera.grabber
+        last_seq = 0
+        while self.running and grabber.running:
+            captured = grabber.read(after_seq=last_seq)
+            if captured is None:
+                continue
+            last_seq = captured.seq
+            camera.skip_count += 1
+            if camera.skip_count < self.max_frame_skip:
+                continue
+            camera.skip_count = 0
+            self.pipeline.submit(FrameJob.from_capture(captured, camera.name))
+
+    def handle_recognition(self, job):
+        """Mark attendance for recognized faces"""
+        if self.controller.observe(job.timings, time.time() - job.timestamp):
+            self.max_frame_skip = self.controller.frame_skip
+            self.engine.scale = self.controller.scale
+            self.engine.upsample = self.controller.upsample
+        self.cameras.record(job.source, job.timestamp, len(job.faces))
+
+        for _, name, _, accepted, confidence in job.faces:
+            self.session.observe(name, accepted, job.source, confidence)
+
+    def get_status(self, state="running"):
+        """Get attendance counts and recognition statistics"""
+        status = {
+            'state': state,
+            'pid': os.getpid(),
+            'updated_at': datetime.now().isoformat(timespec="seconds"),
+            'uptime': round(time.time() - self.started_at, 1) if self.started_at else 0.0,
+            'total_students': len(self.student_data),
+            'present': len(self.session.present_students),
+            'unknown_detected': self.session.unknown_count,
+            'recent_events': list(self.session.events),
+        }
+        if self.cameras:
+            status['cameras'] = self.cameras.get_stats()
+        if self.pipeline:
+            status['pipeline'] = self.pipeline.get_stats()
+        status['engine'] = self.engine.get_stats()
+        status['controller'] = self.controller.get_metrics()
+        return status
+
+    def write_status(self, state="running"):
+        """Atomically replace the status file"""
+        tmp_path = self.status_path.with_name(self.status_path.name + ".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.get_status(state), f, indent=2, default=str)
+            os.replace(tmp_path, self.status_path)
+        except OSError as e:
+            print(f"❌ Could not write status file: {e}")
@@ -17,10 +17,18 @@ import json
 import signal
 import sys
 from pathlib import Path
+from .recognition.encoding_cache import EncodingCache, CACHE_FILENAME
+from .recognition.enrollment import enroll_gallery
+from .recognition.gallery import FaceGallery
+from .recognition.multicam import CameraManager
+from .services.attendance_log import AttendanceLog
 
 class FaceRecognitionApp:
     """Base Face Recognition Application Class"""
     
+    enrollment_workers = None  # None uses every CPU core
+    camera_sources = [0]  # Device indices, video files, image folders or stream URLs
+    
     def __init__(self, is_dev_mode=False):
         self.is_dev_mode = is_dev_mode
         self.setup_paths()
@@ -46,6 +54,7 @@ class FaceRecognitionApp:
         self.attendance_path = self.app_dir / "attendance.csv"
         self.bg_image_path = self.app_dir / "Images" / "Background" / "cube.jpg"
         self.students_json_path = self.students_dir / "students.json"
+        self.encoding_cache_path = self.students_dir / CACHE_FILENAME
         
         print(f"📁 App Directory: {self.app_dir}")
         print(f"📁 Project Root: {self.project_root}")
@@ -69,56 +78,26 @@ class FaceRecognitionApp:
         if not self.students_dir.exists():
             raise FileNotFoundError(f"Student images folder not found: {self.students_dir}")
         
-        if not self.attendance_path.exists():
-            with open(self.attendance_path, "w") as f:
-                f.write("Name,Timestamp\n")
-            print(f"✅ Created attendance file: {self.attendance_path}")
+        self.attendance_log = AttendanceLog(self.attendance_path)
+        self.attendance_log.prepare()
     
     def load_face_encodings(self):
-        """Load and encode student faces"""
-        self.encode_list_known = []
-        self.student_names = []
+        """Load and encode student faces, reusing cached encodings for unchanged images"""
+        self.gallery = FaceGallery()
         
         if not self.students_dir.exists():
             print("⚠️  Students directory not found")
             return
         
-        for student in os.listdir(self.students_dir):
-            folder = self.students_dir / student
-            if not folder.is_dir():
-                continue
-                
-            for file in os.listdir(folder):
-                path = folder / file
-                img = cv2.imread(str(path))
-                if img is None:
-                    continue
-                    
-                rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                encs = face_recognition.face_encodings(rgb)
-                if encs:
-                    self.encode_list_known.append(encs[0])
-                    self.student_names.append(student.upper())
+        cache = EncodingCache(self.encoding_cache_path, root_dir=self.students_dir)
+        self.gallery = enroll_gallery(self.students_dir, cache=cache, workers=self.enrollment_workers)
         
-        print(f"✅ Loaded {len(self.encode_list_known)} encodings for {len(set(self.student_names))} students")
+        print(f"✅ Loaded {len(self.gallery)} encodings for {self.gallery.num_students} students "
+              f"({cache.hits} cached, {cache.misses} encoded)")
     
     def mark_attendance(self, name):
         """Mark student attendance"""
-        try:
-            with open(self.attendance_path, "r+", newline="") as f:
-                entries = f.readlines()
-                names = [e.split(',')[0] for e in entries]
-                if name not in names:
-                    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    f.write(f"{name},{now}\n")
-                    print(f"✅ Marked {name} at {now}")
-                    return True
-                else:
-                    print(f"⚠️  {name} already marked today")
-                    return False
-        except Exception as e:
-            print(f"❌ Error marking attendance: {e}")
-            return False
+        return self.attendance_log.mark(name)
     
     def setup_gui(self):
         """Setup the main GUI window"""
@@ -136,6 +115,8 @@ class FaceRecognitionApp:
         self.running = False
         self.camera_initialized = False
         self.cap = None
+        self.grabber = None
+        self.cameras = None
         self.present_students = set()
         self.unknown_count = 0
         self.color_index = 0
@@ -207,10 +188,15 @@ class FaceRecognitionApp:
             return
         
         try:
-            self.cap = cv2.VideoCapture(0)
-            if not self.cap.isOpened():
+            # Each source is drained on its own thread so processing sees the freshest frame
+            self.cameras = CameraManager(self.camera_sources)
+            if not self.cameras.open():
+                self.cameras = None
                 raise Exception("Failed to open camera")
             
+            # The first camera is the one shown in the preview
+            self.cap = self.cameras.primary.cap
+            self.grabber = self.cameras.primary.grabber
             self.camera_initialized = True
             self.running = True
             
@@ -225,9 +211,11 @@ class FaceRecognitionApp:
     def stop_camera(self):
         """Stop the camera feed"""
         self.running = False
-        if self.cap:
-            self.cap.release()
-            self.cap = None
+        if self.cameras:
+            self.cameras.stop()
+            self.cameras = None
+        self.grabber = None
+        self.cap = None
         self.camera_initialized = False
         print("✅ Camera stopped")
     
@@ -235,6 +223,12 @@ class FaceRecognitionApp:
         """Update camera frame (to be implemented by subclasses)"""
         pass
     
+    def get_capture_stats(self):
+        """Get per-camera capture and processing statistics (frames, drops, FPS, latency)"""
+        if not self.cameras:
+            return {}
+        return self.cameras.get_stats()
+    
     # Methods that components expect
     def toggle_camera(self):
         """Toggle camera on/off"""
@@ -0,0 +1,7 @@
+"""
+Recognition Package for Face Recognition Attendance System
+Handles face encoding, gallery management and matching
+"""
+
+__version__ = "1.0.0"
+__author__ = "Face Recognition Team"
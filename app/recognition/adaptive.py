@@ -0,0 +1,121 @@
+"""
+Adaptive Controller
+Tunes frame skip, detection scale and upsampling to meet a latency budget
+"""
+
+import threading
+from typing import Dict, Optional, Sequence
+
+
+class AdaptiveController:
+    """Feedback controller for recognition cost
+
+    Smoothed end-to-end latency (capture to result) is compared with the
+    budget. Over budget, the controller first drops upsampling, then the
+    detection scale, then processes fewer frames; with spare headroom it
+    undoes those steps in reverse order. Every setting stays within its
+    configured bounds.
+    """
+
+    def __init__(self, latency_budget: float = 0.2, frame_skip: int = 2, min_skip: int = 1, max_skip: int = 6,
+                 scales: Sequence[float] = (0.2, 0.25, 0.33, 0.5), scale: float = 0.25,
+                 min_upsample: int = 0, max_upsample: int = 2, upsample: int = 1,
+                 headroom: float = 0.6, smoothing: float = 0.2, settle_frames: int = 15):
+        self.latency_budget = latency_budget  # Seconds
+        self.min_skip = min_skip
+        self.max_skip = max_skip
+        self.scales = sorted(scales)
+        self.min_upsample = min_upsample
+        self.max_upsample = max_upsample
+        self.headroom = headroom  # Improve only below headroom * budget
+        self.smoothing = smoothing
+        self.settle_frames = settle_frames  # Frames to observe between adjustments
+
+        self.frame_skip = min(max(frame_skip, min_skip), max_skip)
+        self._scale_index = min(range(len(self.scales)), key=lambda i: abs(self.scales[i] - scale))
+        self.upsample = min(max(upsample, min_upsample), max_upsample)
+
+        self._lock = threading.Lock()
+        self._stage_times: Dict[str, float] = {}
+        self.latency = 0.0
+        self.processing = 0.0
+        self.observed = 0
+        self._since_adjustment = 0
+        self.adjustments = 0
+        self.last_decision = "initial"
+
+    @property
+    def scale(self) -> float:
+        return self.scales[self._scale_index]
+
+    def _smooth(self, current: float, value: float) -> float:
+        return value if self.observed <= 1 else current + self.smoothing * (value - current)
+
+    def observe(self, timings: Dict[str, float], latency: float) -> bool:
+        """Record one processed frame, returning True if the settings changed"""
+        with self._lock:
+            self.observed += 1
+            self._since_adjustment += 1
+            for stage, seconds in timings.items():
+                self._stage_times[stage] = self._smooth(self._stage_times.get(stage, seconds), seconds)
+            self.processing = self._smooth(self.processing, sum(timings.values()))
+            self.latency = self._smooth(self.latency, latency)
+
+            if self._since_adjustment < self.settle_frames:
+                return False
+
+            if self.latency > self.latency_budget:
+                decision = self._degrade()
+            elif self.latency < self.latency_budget * self.headroom:
+                decision = self._improve()
+            else:
+                decision = None
+
+            if decision is None:
+                return False
+            self._since_adjustment = 0
+            self.adjustments += 1
+            self.last_decision = decision
+            print(f"⚙️  Adaptive: {decision} (latency {self.latency * 1000:.0f} ms, "
+                  f"budget {self.latency_budget * 1000:.0f} ms)")
+            return True
+
+    def _degrade(self) -> Optional[str]:
+        if self.upsample > self.min_upsample:
+            self.upsample -= 1
+            return f"upsample -> {self.upsample}"
+        if self._scale_index > 0:
+            self._scale_index -= 1
+            return f"scale -> {self.scale}"
+        if self.frame_skip < self.max_skip:
+            self.frame_skip += 1
+            return f"frame skip -> {self.frame_skip}"
+        return None
+
+    def _improve(self) -> Optional[str]:
+        if self.frame_skip > self.min_skip:
+            self.frame_skip -= 1
+            return f"frame skip -> {self.frame_skip}"
+        if self._scale_index < len(self.scales) - 1:
+            self._scale_index += 1
+            return f"scale -> {self.scale}"
+        if self.upsample < self.max_upsample:
+            self.upsample += 1
+            return f"upsample -> {self.upsample}"
+        return None
+
+    def get_metrics(self) -> Dict[str, object]:
+        """Get the current settings and the measurements behind them"""
+        with self._lock:
+            return {
+                "frame_skip": self.frame_skip,
+                "scale": self.scale,
+                "upsample": self.upsample,
+                "latency_budget_ms": round(self.latency_budget * 1000, 1),
+                "latency_ms": round(self.latency * 1000, 1),
+                "processing_ms": round(self.processing * 1000, 1),
+                "stage_ms": {stage: round(t * 1000, 1) for stage, t in self._stage_times.items()},
+                "observed_frames": self.observed,
+                "adjustments": self.adjustments,
+                "last_decision": self.last_decision,
+            }
@@ -0,0 +1,257 @@
+"""
+Batch Recognition
+Runs the attendance recognition engine over recorded video files and image folders
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .detectors import create_detector
+from .engine import FrameJob, RecognitionEngine
+from .gallery import FaceGallery
+from .matcher import BatchMatcher, DEFAULT_TOLERANCE
+from .multicam import IMAGE_EXTENSIONS
+from .tracker import FaceTracker
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v")
+
+Segment = Tuple[str, int, Optional[int]]  # (path, first frame, end frame or None for the rest)
+
+
+class Sighting:
+    """First time a student was recognized in a segment"""
+
+    __slots__ = ("name", "source", "offset", "distance", "confidence")
+
+    def __init__(self, name: str, source: str, offset: float, distance: float, confidence: float):
+        self.name = name
+        self.source = source  # Video file or image folder
+        self.offset = offset  # Seconds into the video, or image index in a folder
+        self.distance = distance
+        self.confidence = confidence
+
+
+class SegmentResult:
+    """Outcome of recognizing one segment of a file"""
+
+    __slots__ = ("path", "start", "frames", "faces", "seconds", "sightings", "error")
+
+    def __init__(self, path: str, start: int):
+        self.path = path
+        self.start = start
+        self.frames = 0
+        self.faces = 0
+        self.seconds = 0.0
+        self.sightings: Dict[str, Sighting] = {}
+        self.error: Optional[str] = None
+
+
+def list_inputs(paths: Sequence) -> List[Path]:
+    """Expand the given paths into video files and image folders
+
+    Folders holding images are used as-is; other folders are searched for
+    videos one level down.
+    """
+    inputs = []
+    for path in map(Path, paths):
+        if path.is_file() and path.suffix.lower() in VIDEO_EXTENSIONS:
+            inputs.append(path)
+        elif path.is_dir():
+            entries = sorted(path.iterdir())
+            if any(entry.suffix.lower() in IMAGE_EXTENSIONS for entry in entries):
+                inputs.append(path)
+            inputs.extend(entry for entry in entries
+                          if entry.is_file() and entry.suffix.lower() in VIDEO_EXTENSIONS)
+        else:
+            print(f"⚠️  Skipping unsupported input: {path}")
+    return inputs
+
+
+def count_frames(path: Path) -> int:
+    """Get the number of frames in a video, or images in a folder (0 if unknown)"""
+    import cv2
+
+    if path.is_dir():
+        return sum(1 for entry in path.iterdir() if entry.suffix.lower() in IMAGE_EXTENSIONS)
+    cap = cv2.VideoCapture(str(path))
+    try:
+        return max(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 0)
+    finally:
+        cap.release()
+
+
+def plan_segments(inputs: Sequence[Path], workers: int, min_frames: int = 300) -> List[Segment]:
+    """Split inputs into segments so every worker has something to decode
+
+    Files are split into contiguous frame ranges only when there are fewer
+    files than workers, and never into ranges shorter than `min_frames`.
+    """
+    per_file = max(workers // max(len(inputs), 1), 1)
+    segments = []
+    for path in inputs:
+        total = count_frames(path) if per_file > 1 else 0
+        parts = min(per_file, total // min_frames) if total else 1
+        if parts <= 1:
+            segments.append((str(path), 0, None))
+            continue
+        bounds = np.linspace(0, total, parts + 1).astype(int)
+        segments.extend((str(path), int(start), int(end)) for start, end in zip(bounds[:-1], bounds[1:]))
+    return segments
+
+
+def iter_frames(path: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[float, np.ndarray]]:
+    """Yield (offset, BGR frame) for a range of frames of a video or image folder"""
+    import cv2
+
+    folder = Path(path)
+    if folder.is_dir():
+        images = sorted(entry for entry in folder.iterdir() if entry.suffix.lower() in IMAGE_EXTENSIONS)
+        for index in range(start, len(images) if end is None else min(end, len(images))):
+            frame = cv2.imread(str(images[index]))
+            if frame is not None:
+                yield float(index), frame
+        return
+
+    cap = cv2.VideoCapture(path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+        if start:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        index = start
+        while end is None or index < end:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield index / fps, frame
+            index += 1
+    finally:
+        cap.release()
+
+
+_worker_settings = {}
+
+
+def _init_worker(matrix: np.ndarray, row_names: List[str], settings: dict):
+    """Build the gallery once per worker process"""
+    import cv2
+    cv2.setNumThreads(1)
+    _worker_settings.clear()
+    _worker_settings.update(settings)
+    _worker_settings["gallery"] = FaceGallery.from_encodings(matrix, row_names)
+
+
+def recognize_segment(segment: Segment) -> SegmentResult:
+    """Run detection, encoding and matching over one segment as fast as possible
+
+    Videos are tracked between detections like a live camera; image folders
+    are treated as unrelated pictures and every image is fully processed.
+    """
+    path, start, end = segment
+    settings = _worker_settings
+    result = SegmentResult(path, start)
+    matcher = BatchMatcher(settings["gallery"], tolerance=settings["tolerance"], margin=settings["margin"])
+    tracker = None if Path(path).is_dir() else FaceTracker(detect_interval=settings["detect_interval"])
+    engine = RecognitionEngine(matcher, scale=settings["scale"], upsample=settings["upsample"], tracker=tracker,
+                               detector=create_detector(settings["detector"], prefilter=settings["prefilter"]))
+    frame_step = settings["frame_step"]
+
+    began = time.perf_counter()
+    try:
+        for index, (offset, frame) in enumerate(iter_frames(path, start, end)):
+            if index % frame_step:
+                continue
+            # Track on the video's own timeline, so reverification and voting
+            # intervals mean the same thing however fast the frames are decoded
+            job = engine.process(FrameJob(index + 1, offset, frame))
+            result.frames += 1
+            if job is None:
+                continue
+            result.faces += len(job.faces)
+            for _, name, distance, accepted, confidence in job.faces:
+                if accepted and name not in result.sightings:
+                    result.sightings[name] = Sighting(name, path, offset, distance, confidence)
+    except Exception as e:
+        result.error = str(e)
+    result.seconds = time.perf_counter() - began
+    return result
+
+
+class BatchReport:
+    """Attendance records and throughput for a batch run"""
+
+    def __init__(self, results: List[SegmentResult], wall_seconds: float):
+        self.results = results
+        self.wall_seconds = wall_seconds
+        self.frames = sum(result.frames for result in results)
+        self.faces = sum(result.faces for result in results)
+
+        # Earliest sighting per student, in input order
+        self.records: Dict[str, Sighting] = {}
+        for result in results:
+            for name, sighting in result.sightings.items():
+                self.records.setdefault(name, sighting)
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def faces_per_second(self) -> float:
+        return self.faces / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def write_csv(self, path):
+        """Write one attendance record per student"""
+        with open(path, "w", newline="") as f:
+            f.write("Name,Source,Offset,Distance,Confidence\n")
+            for sighting in self.records.values():
+                f.write(f"{sighting.name},{sighting.source},{sighting.offset:.2f},{sighting.distance:.4f},"
+                        f"{sighting.confidence:.3f}\n")
+
+    def summary(self) -> str:
+        lines = [
+            f"📊 {self.frames} frames, {self.faces} faces in {self.wall_seconds:.1f}s "
+            f"({self.fps:.1f} frames/s, {self.faces_per_second:.1f} faces/s)",
+            f"✅ {len(self.records)} students recognized",
+        ]
+        for result in self.results:
+            if result.error:
+                lines.append(f"❌ {result.path} (from frame {result.start}): {result.error}")
+        return "\n".join(lines)
+
+
+def run_batch(paths: Sequence, gallery: FaceGallery, workers: Optional[int] = None,
+              tolerance: float = DEFAULT_TOLERANCE, margin: float = 0.05, scale: float = 0.25,
+              upsample: int = 1, detect_interval: int = 10, frame_step: int = 1,
+              detector: str = "hog", prefilter: Optional[str] = None) -> BatchReport:
+    """Recognize faces in video files and image folders across a pool of processes
+
+    Each worker decodes and processes its own segments, so decoding runs in
+    parallel across files (and across ranges of long files).
+    """
+    inputs = list_inputs(paths)
+    workers = workers or os.cpu_count() or 1
+    segments = plan_segments(inputs, workers)
+    settings = {
+        "tolerance": tolerance, "margin": margin, "scale": scale, "upsample": upsample,
+        "detect_interval": detect_interval, "frame_step": max(frame_step, 1), "detector": detector,
+        "prefilter": prefilter,
+    }
+    row_names = [gallery.name_of(int(label)) for label in gallery.labels if label >= 0]
+    matrix = gallery.matrix[gallery.labels >= 0]
+    workers = min(workers, len(segments))
+    print(f"🔄 Processing {len(inputs)} inputs as {len(segments)} segments with {max(workers, 1)} workers")
+
+    began = time.perf_counter()
+    if workers <= 1:
+        _init_worker(matrix, row_names, settings)
+        results = [recognize_segment(segment) for segment in segments]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(matrix, row_names, settings)) as pool:
+            results = list(pool.map(recognize_segment, segments))
+    return BatchReport(results, time.perf_counter() - began)
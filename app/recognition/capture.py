@@ -0,0 +1,124 @@
+"""
+Frame Capture
+Drains a capture device on a dedicated thread into a single latest-frame slot
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class CapturedFrame:
+    """A frame with its sequence number and capture timestamp"""
+
+    __slots__ = ("seq", "timestamp", "image")
+
+    def __init__(self, seq: int, timestamp: float, image: np.ndarray):
+        self.seq = seq
+        self.timestamp = timestamp  # time.time() when the frame was read
+        self.image = image
+
+    @property
+    def age(self) -> float:
+        """Seconds since the frame was captured"""
+        return time.time() - self.timestamp
+
+
+class FrameGrabber:
+    """Continuously reads a capture device so consumers always get the freshest frame
+
+    Only the latest frame is kept. Frames replaced before anyone read them
+    are counted as dropped.
+    """
+
+    def __init__(self, cap, name: str = "camera"):
+        self.cap = cap
+        self.name = name
+        self.running = False
+        self._thread: Optional[threading.Thread] = None
+        self._cond = threading.Condition()
+        self._latest: Optional[CapturedFrame] = None
+        self._seq = 0
+        self._consumed_seq = 0
+
+        # Stats
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.read_failures = 0
+        self._fps = 0.0
+        self._last_capture = None
+
+    def start(self):
+        """Start the capture thread"""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name=f"capture-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """Stop the capture thread and wake any waiting readers"""
+        self.running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        """Read frames as fast as the device delivers them"""
+        while self.running:
+            try:
+                ret, image = self.cap.read()
+            except Exception as e:
+                print(f"❌ Capture error on {self.name}: {e}")
+                ret, image = False, None
+
+            if not ret:
+                self.read_failures += 1
+                time.sleep(0.01)
+                continue
+
+            now = time.time()
+            if self._last_capture is not None:
+                interval = now - self._last_capture
+                if interval > 0:
+                    self._fps = 0.9 * self._fps + 0.1 * (1.0 / interval) if self._fps else 1.0 / interval
+            self._last_capture = now
+
+            with self._cond:
+                if self._latest is not None and self._latest.seq > self._consumed_seq:
+                    self.frames_dropped += 1
+                self._seq += 1
+                self.frames_captured += 1
+                self._latest = CapturedFrame(self._seq, now, image)
+                self._cond.notify_all()
+
+    def read(self, after_seq: int = 0, timeout: Optional[float] = 1.0) -> Optional[CapturedFrame]:
+        """Wait for a frame newer than `after_seq` and return it
+
+        Returns None on timeout or when the grabber is stopped.
+        """
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: not self.running or (self._latest is not None and self._latest.seq > after_seq),
+                timeout,
+            )
+            if not ready or not self.running or self._latest is None or self._latest.seq <= after_seq:
+                return None
+            frame = self._latest
+            self._consumed_seq = max(self._consumed_seq, frame.seq)
+            return frame
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get capture statistics"""
+        captured = self.frames_captured
+        return {
+            "frames_captured": captured,
+            "frames_dropped": self.frames_dropped,
+            "drop_ratio": self.frames_dropped / captured if captured else 0.0,
+            "read_failures": self.read_failures,
+            "capture_fps": round(self._fps, 1),
+        }
@@ -0,0 +1,113 @@
+"""
+Detector Cascade
+Runs a cheap prefilter on a tiny frame and the accurate detector only where it finds candidates
+"""
+
+import threading
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+from .detectors import FaceDetector
+from .models import Box
+from .roi import expand_box, merge_windows, suppress_duplicates
+
+
+class CascadeDetector(FaceDetector):
+    """Two-tier detector: prefilter first, accurate detector second
+
+    The prefilter scans a copy of the image at most `tiny_width` pixels
+    wide. Frames without candidates are rejected outright; otherwise the
+    accurate detector scans expanded windows around the candidates, or the
+    whole image once the windows cover more than `max_window_ratio` of it.
+
+    Every `audit_interval`-th rejected frame is still scanned in full, so
+    the prefilter's miss rate can be measured and tuned.
+    """
+
+    def __init__(self, prefilter: FaceDetector, detector: FaceDetector, tiny_width: int = 160,
+                 expand: float = 0.5, max_window_ratio: float = 0.5, audit_interval: int = 20):
+        self.prefilter = prefilter
+        self.detector = detector
+        self.name = f"{prefilter.name}+{detector.name}"
+        self.tiny_width = tiny_width
+        self.expand = expand
+        self.max_window_ratio = max_window_ratio
+        self.audit_interval = audit_interval
+        self._lock = threading.Lock()
+
+        # Stats
+        self.frames = 0
+        self.passed = 0  # Frames with prefilter candidates
+        self.hits = 0  # Passed frames where the detector found faces
+        self.rejected = 0
+        self.audited = 0  # Rejected frames scanned anyway
+        self.misses = 0  # Audited frames where the detector found faces
+
+    def _candidates(self, rgb: np.ndarray) -> List[Box]:
+        """Run the prefilter on a tiny copy, returning windows in full image coordinates"""
+        height, width = rgb.shape[:2]
+        factor = min(self.tiny_width / width, 1.0)
+        tiny = cv2.resize(rgb, (self.tiny_width, max(int(height * factor), 1)),
+                          interpolation=cv2.INTER_AREA) if factor < 1.0 else rgb
+        return [
+            expand_box((int(top / factor), int(right / factor), int(bottom / factor), int(left / factor)),
+                       self.expand, rgb.shape)
+            for top, right, bottom, left in self.prefilter.detect(tiny, 0)
+        ]
+
+    def detect(self, rgb: np.ndarray, upsample: int = 1) -> List[Box]:
+        candidates = self._candidates(rgb)
+
+        if not candidates:
+            with self._lock:
+                self.frames += 1
+                self.rejected += 1
+                audit = self.audit_interval and self.rejected % self.audit_interval == 0
+            if not audit:
+                return []
+            boxes = self.detector.detect(rgb, upsample)
+            with self._lock:
+                self.audited += 1
+                self.misses += bool(boxes)
+            return boxes
+
+        height, width = rgb.shape[:2]
+        windows = merge_windows(candidates)
+        covered = sum((bottom - top) * (right - left) for top, right, bottom, left in windows)
+        if covered > self.max_window_ratio * width * height:
+            boxes = self.detector.detect(rgb, upsample)
+        else:
+            boxes = []
+            for top, right, bottom, left in windows:
+                for t, r, b, l in self.detector.detect(np.ascontiguousarray(rgb[top:bottom, left:right]), upsample):
+                    boxes.append((t + top, r + left, b + top, l + left))
+            boxes = suppress_duplicates(boxes)
+
+        with self._lock:
+            self.frames += 1
+            self.passed += 1
+            self.hits += bool(boxes)
+        return boxes
+
+    def get_counts(self) -> Dict[str, int]:
+        """Get the raw counters, e.g. to sum them across worker processes"""
+        return {"frames": self.frames, "passed": self.passed, "hits": self.hits,
+                "audited": self.audited, "misses": self.misses}
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get prefilter pass, hit and estimated miss rates"""
+        return cascade_rates(self.get_counts())
+
+
+def cascade_rates(counts: Dict[str, int]) -> Dict[str, float]:
+    """Turn cascade counters into pass, hit and estimated miss rates"""
+    frames, passed, audited = counts["frames"], counts["passed"], counts["audited"]
+    return {
+        "frames": frames,
+        "pass_ratio": passed / frames if frames else 0.0,
+        "hit_rate": counts["hits"] / passed if passed else 0.0,  # Candidates confirmed as faces
+        "miss_rate": counts["misses"] / audited if audited else 0.0,  # Faces the prefilter missed
+        "audited": audited,
+    }
@@ -0,0 +1,305 @@
+"""
+Face Detector Backends
+Interchangeable face detectors with a common box format and a calibration benchmark
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .models import Box
+from .tracker import box_iou
+
+DNN_WEIGHTS_DIR = Path(__file__).parent / "weights"
+DNN_PROTOTXT = "deploy.prototxt"
+DNN_MODEL = "res10_300x300_ssd_iter_140000.caffemodel"
+
+
+def clip_box(top: float, right: float, bottom: float, left: float, width: int, height: int) -> Box:
+    """Round a box to (top, right, bottom, left) pixels inside the image"""
+    return (max(int(top), 0), min(int(right), width), min(int(bottom), height), max(int(left), 0))
+
+
+class FaceDetector:
+    """Base class for face detector backends
+
+    `detect` takes an RGB image and returns (top, right, bottom, left) boxes
+    clipped to the image, the format used by face_recognition. `upsample`
+    asks for smaller faces to be found, at extra cost.
+    """
+
+    name = "base"
+
+    def detect(self, rgb: np.ndarray, upsample: int = 1) -> List[Box]:
+        raise NotImplementedError
+
+
+class HOGDetector(FaceDetector):
+    """dlib HOG + linear SVM detector (face_recognition's default "hog" model)"""
+
+    name = "hog"
+
+    def __init__(self):
+        import dlib
+        self.detector = dlib.get_frontal_face_detector()
+
+    def detect(self, rgb: np.ndarray, upsample: int = 1) -> List[Box]:
+        height, width = rgb.shape[:2]
+        return [clip_box(rect.top(), rect.right(), rect.bottom(), rect.left(), width, height)
+                for rect in self.detector(rgb, upsample)]
+
+
+class CNNDetector(FaceDetector):
+    """dlib MMOD CNN detector: most accurate, much slower without a GPU"""
+
+    name = "cnn"
+
+    def __init__(self):
+        import dlib
+        import face_recognition_models
+        self.detector = dlib.cnn_face_detection_model_v1(face_recognition_models.cnn_face_detector_model_location())
+
+    def detect(self, rgb: np.ndarray, upsample: int = 1) -> List[Box]:
+        height, width = rgb.shape[:2]
+        return [clip_box(d.rect.top(), d.rect.right(), d.rect.bottom(), d.rect.left(), width, height)
+                for d in self.detector(rgb, upsample)]
+
+
+class HaarCascadeDetector(FaceDetector):
+    """OpenCV Haar cascade: fastest, with more misses on turned faces"""
+
+    name = "haar"
+
+    def __init__(self, scale_factor: float = 1.1, min_neighbors: int = 5,
+                 cascade: str = "haarcascade_frontalface_default.xml"):
+        import cv2
+        self._cv2 = cv2
+        self.classifier = cv2.CascadeClassifier(cv2.data.haarcascades + cascade)
+        if self.classifier.empty():
+            raise FileNotFoundError(f"Could not load Haar cascade {cascade}")
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+
+    def detect(self, rgb: np.ndarray, upsample: int = 1) -> List[Box]:
+        cv2 = self._cv2
+        height, width = rgb.shape[:2]
+        gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+        factor = 2 ** max(upsample, 0)
+        if factor > 1:
+            gray = cv2.resize(gray, (width * factor, height * factor), interpolation=cv2.INTER_LINEAR)
+        gray = cv2.equalizeHist(gray)
+        faces = self.classifier.detectMultiScale(gray, self.scale_factor, self.min_neighbors)
+        return [clip_box(y / factor, (x + w) / factor, (y + h) / factor, x / factor, width, height)
+                for x, y, w, h in faces]
+
+
+class DNNDetector(FaceDetector):
+    """OpenCV DNN ResNet-10 SSD detector
+
+    Needs the Caffe model files in `weights_dir`. The network always runs
+    at 300x300, so `upsample` has no effect.
+    """
+
+    name = "dnn"
+
+    def __init__(self, weights_dir=DNN_WEIGHTS_DIR, confidence: float = 0.5):
+        import cv2
+        self._cv2 = cv2
+        prototxt = Path(weights_dir) / DNN_PROTOTXT
+        model = Path(weights_dir) / DNN_MODEL
+        if not prototxt.exists() or not model.exists():
+            raise FileNotFoundError(f"DNN face model not found in {weights_dir} ({DNN_PROTOTXT}, {DNN_MODEL})")
+        self.net = cv2.dnn.readNetFromCaffe(str(prototxt), str(model))
+        self.confidence = confidence
+
+    def detect(self, rgb: np.ndarray, upsample: int = 1) -> List[Box]:
+        cv2 = self._cv2
+        height, width = rgb.shape[:2]
+        # The model expects BGR input, so swap channels while building the blob
+        blob = cv2.dnn.blobFromImage(rgb, 1.0, (300, 300), (104.0, 177.0, 123.0), swapRB=True)
+        self.net.setInput(blob)
+        detections = self.net.forward()[0, 0]
+        detections = detections[detections[:, 2] >= self.confidence]
+        return [clip_box(y1 * height, x2 * width, y2 * height, x1 * width, width, height)
+                for _, _, _, x1, y1, x2, y2 in detections]
+
+
+class SkinBlobDetector(FaceDetector):
+    """Skin-colour blob finder: nearly free, but returns loose candidate regions
+
+    Only meant as a prefilter for an accurate detector. Pixels inside the
+    usual YCrCb skin range are grouped into blobs, and blobs with a
+    plausible size and shape become candidate boxes.
+    """
+
+    name = "skin"
+
+    def __init__(self, min_area: float = 0.002, max_area: float = 0.5,
+                 cr_range: Sequence[int] = (133, 173), cb_range: Sequence[int] = (77, 127)):
+        import cv2
+        self._cv2 = cv2
+        self.min_area = min_area  # Fraction of the image
+        self.max_area = max_area
+        self.lower = np.array([0, cr_range[0], cb_range[0]], dtype=np.uint8)
+        self.upper = np.array([255, cr_range[1], cb_range[1]], dtype=np.uint8)
+        self.kernel = np.ones((3, 3), dtype=np.uint8)
+
+    def detect(self, rgb: np.ndarray, upsample: int = 1) -> List[Box]:
+        cv2 = self._cv2
+        height, width = rgb.shape[:2]
+        mask = cv2.inRange(cv2.cvtColor(rgb, cv2.COLOR_RGB2YCrCb), self.lower, self.upper)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+        area = float(width * height)
+        boxes = []
+        for x, y, w, h, pixels in stats[1:count]:
+            if not self.min_area <= pixels / area <= self.max_area:
+                continue
+            if not 0.4 <= w / max(h, 1) <= 2.5:
+                continue
+            boxes.append(clip_box(y, x + w, y + h, x, width, height))
+        return boxes
+
+
+DETECTOR_BACKENDS = {
+    "hog": HOGDetector,
+    "cnn": CNNDetector,
+    "haar": HaarCascadeDetector,
+    "dnn": DNNDetector,
+    "skin": SkinBlobDetector,
+}
+
+
+class ThreadLocalDetector(FaceDetector):
+    """A detector backend with one instance per thread
+
+    dlib detectors and OpenCV nets are not safe to call concurrently, so
+    each pipeline worker lazily builds its own copy.
+    """
+
+    def __init__(self, backend: str = "hog", **options):
+        if backend not in DETECTOR_BACKENDS:
+            raise ValueError(f"Unknown detector backend: {backend} (choose from {', '.join(DETECTOR_BACKENDS)})")
+        self.name = backend
+        self.options = options
+        self._local = threading.local()
+
+    def get(self) -> FaceDetector:
+        """Get the calling thread's detector, creating it on first use"""
+        detector = getattr(self._local, "detector", None)
+        if detector is None:
+            detector = DETECTOR_BACKENDS[self.name](**self.options)
+            self._local.detector = detector
+        return detector
+
+    def detect(self, rgb: np.ndarray, upsample: int = 1) -> List[Box]:
+        return self.get().detect(rgb, upsample)
+
+
+def create_detector(backend: str = "hog", prefilter: Optional[str] = None, **options) -> FaceDetector:
+    """Create a thread-safe detector for a backend name ("hog", "cnn", "haar" or "dnn")
+
+    With a `prefilter` backend (e.g. "haar" or "skin"), the result is a
+    two-tier cascade that only runs `backend` where the prefilter finds
+    candidates.
+    """
+    detector = ThreadLocalDetector(backend, **options)
+    if prefilter:
+        from .cascade import CascadeDetector
+        return CascadeDetector(ThreadLocalDetector(prefilter), detector)
+    return detector
+
+
+def calibrate(images: Sequence[np.ndarray], backends: Sequence[str] = ("hog", "cnn", "haar", "dnn"),
+              reference: Optional[Sequence[List[Box]]] = None, reference_backend: str = "cnn",
+              upsample: int = 1, iou_threshold: float = 0.5) -> Dict[str, Dict[str, float]]:
+    """Measure speed, recall and precision of each backend on a set of RGB images
+
+    Accuracy is scored against `reference` boxes when given, otherwise
+    against the output of `reference_backend`. Backends that cannot be
+    loaded are skipped.
+    """
+    detectors = {}
+    for backend in backends:
+        try:
+            detectors[backend] = DETECTOR_BACKENDS[backend]()
+        except Exception as e:
+            print(f"⚠️  Skipping {backend}: {e}")
+
+    if reference is None:
+        if reference_backend not in detectors:
+            detectors[reference_backend] = DETECTOR_BACKENDS[reference_backend]()
+        reference = [detectors[reference_backend].detect(image, upsample) for image in images]
+
+    results = {}
+    for backend, detector in detectors.items():
+        if backend not in backends:
+            continue
+        detector.detect(images[0], upsample)  # Warm up
+        found = true_positives = expected = 0
+        start = time.perf_counter()
+        boxes = [detector.detect(image, upsample) for image in images]
+        elapsed = time.perf_counter() - start
+
+        for predicted, truth in zip(boxes, reference):
+            found += len(predicted)
+            expected += len(truth)
+            if predicted and truth:
+                iou = box_iou(truth, predicted)
+                # Greedy one-to-one matching, best overlaps first
+                for _ in range(min(len(truth), len(predicted))):
+                    i, j = np.unravel_index(np.argmax(iou), iou.shape)
+                    if iou[i, j] < iou_threshold:
+                        break
+                    true_positives += 1
+                    iou[i, :] = 0
+                    iou[:, j] = 0
+
+        results[backend] = {
+            "ms_per_image": round(elapsed * 1000 / len(images), 2),
+            "recall": round(true_positives / expected, 3) if expected else 1.0,
+            "precision": round(true_positives / found, 3) if found else 1.0,
+            "faces": found,
+        }
+    return results
+
+
+def pick_backend(results: Dict[str, Dict[str, float]], min_recall: float = 0.9,
+                 min_precision: float = 0.0) -> Optional[str]:
+    """Get the fastest calibrated backend that meets the accuracy floor"""
+    eligible = [backend for backend, stats in results.items()
+                if stats["recall"] >= min_recall and stats["precision"] >= min_precision]
+    return min(eligible, key=lambda backend: results[backend]["ms_per_image"]) if eligible else None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import cv2
+
+    parser = argparse.ArgumentParser(description="Calibrate face detector backends on sample images")
+    parser.add_argument("folder", help="Folder of sample frames from the site's camera")
+    parser.add_argument("--scale", type=float, default=0.25, help="Detection downscale used by the app")
+    parser.add_argument("--upsample", type=int, default=1)
+    parser.add_argument("--reference", default="cnn", help="Backend treated as ground truth")
+    parser.add_argument("--min-recall", type=float, default=0.9)
+    args = parser.parse_args()
+
+    images = []
+    for path in sorted(Path(args.folder).iterdir()):
+        image = cv2.imread(str(path))
+        if image is not None:
+            small = cv2.resize(image, (0, 0), fx=args.scale, fy=args.scale)
+            images.append(cv2.cvtColor(small, cv2.COLOR_BGR2RGB))
+    if not images:
+        raise SystemExit(f"No images found in {args.folder}")
+
+    print(f"Calibrating on {len(images)} images at scale {args.scale} (reference: {args.reference})")
+    results = calibrate(images, reference_backend=args.reference, upsample=args.upsample)
+    print(f"{'backend':>8} {'ms/image':>10} {'recall':>8} {'precision':>10}")
+    for backend, stats in sorted(results.items(), key=lambda item: item[1]["ms_per_image"]):
+        print(f"{backend:>8} {stats['ms_per_image']:>10.2f} {stats['recall']:>8.3f} {stats['precision']:>10.3f}")
+    print(f"Fastest backend with recall >= {args.min_recall}: {pick_backend(results, args.min_recall)}")
@@ -0,0 +1,190 @@
+"""
+Face Encoding Cache
+Persists student face encodings on disk so unchanged photos are not re-encoded
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+CACHE_FILENAME = ".encodings_cache.npz"
+CACHE_FORMAT = 1
+ENCODING_SIZE = 128
+
+
+def get_model_version() -> str:
+    """Get a version string for the dlib models used to compute encodings"""
+    parts = []
+    try:
+        import dlib
+        parts.append(f"dlib-{dlib.__version__}")
+    except Exception:
+        parts.append("dlib-unknown")
+    try:
+        import face_recognition_models
+        parts.append(f"models-{getattr(face_recognition_models, '__version__', 'unknown')}")
+    except Exception:
+        parts.append("models-unknown")
+    return "/".join(parts)
+
+
+def hash_file(path, chunk_size: int = 1 << 20) -> str:
+    """Get the SHA-1 digest of a file's contents"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class EncodingCache:
+    """Binary on-disk cache of face encodings keyed by image identity
+
+    Each entry is keyed by the image path (relative to the gallery root) and
+    validated against the file size, mtime and content hash. The whole cache
+    is invalidated when the dlib model version changes.
+    """
+
+    def __init__(self, cache_path, root_dir=None, model_version: Optional[str] = None):
+        self.cache_path = Path(cache_path)
+        self.root_dir = Path(root_dir) if root_dir else self.cache_path.parent
+        self.model_version = model_version or get_model_version()
+        # rel path -> (size, mtime_ns, digest, encoding or None when no face)
+        self.entries: Dict[str, Tuple[int, int, str, Optional[np.ndarray]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self.load()
+
+    def _key(self, path) -> str:
+        """Get the cache key for an image path"""
+        path = Path(path)
+        try:
+            path = path.relative_to(self.root_dir)
+        except ValueError:
+            pass
+        return path.as_posix()
+
+    def load(self):
+        """Load cached encodings from disk"""
+        self.entries = {}
+        if not self.cache_path.exists():
+            return
+
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as data:
+                if int(data["format"]) != CACHE_FORMAT or str(data["model_version"]) != self.model_version:
+                    print("⚠️  Encoding cache is stale, rebuilding")
+                    self.dirty = True
+                    return
+
+                encodings = data["encodings"]
+                for i, key in enumerate(data["paths"]):
+                    encoding = encodings[i].copy() if data["has_face"][i] else None
+                    self.entries[str(key)] = (
+                        int(data["sizes"][i]),
+                        int(data["mtimes"][i]),
+                        str(data["digests"][i]),
+                        encoding,
+                    )
+            print(f"💾 Loaded {len(self.entries)} cached encodings")
+        except Exception as e:
+            print(f"⚠️  Error loading encoding cache: {e}")
+            self.entries = {}
+            self.dirty = True
+
+    def lookup(self, path) -> Tuple[bool, Optional[np.ndarray]]:
+        """Look up an image, returning (found, encoding)
+
+        The encoding is None when the image was cached as having no face.
+        """
+        key = self._key(path)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        size, mtime_ns, digest, encoding = entry
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.misses += 1
+            return False, None
+
+        if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+            self.hits += 1
+            return True, encoding
+
+        # Touched or copied file: fall back to the content hash
+        if stat.st_size == size and hash_file(path) == digest:
+            self.entries[key] = (size, stat.st_mtime_ns, digest, encoding)
+            self.dirty = True
+            self.hits += 1
+            return True, encoding
+
+        self.misses += 1
+        return False, None
+
+    def store(self, path, encoding: Optional[np.ndarray], digest: Optional[str] = None):
+        """Store the encoding computed for an image (None when no face was found)"""
+        try:
+            stat = os.stat(path)
+            if digest is None:
+                digest = hash_file(path)
+        except OSError as e:
+            print(f"⚠️  Cannot cache {path}: {e}")
+            return
+
+        if encoding is not None:
+            encoding = np.asarray(encoding, dtype=np.float64).reshape(ENCODING_SIZE)
+        self.entries[self._key(path)] = (stat.st_size, stat.st_mtime_ns, digest, encoding)
+        self.dirty = True
+
+    def prune(self, paths: Iterable):
+        """Drop entries for images that are no longer in the gallery"""
+        keep = {self._key(path) for path in paths}
+        stale = [key for key in self.entries if key not in keep]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self.dirty = True
+
+    def save(self) -> bool:
+        """Write the cache to disk if it changed"""
+        if not self.dirty:
+            return True
+
+        count = len(self.entries)
+        keys = list(self.entries)
+        encodings = np.zeros((count, ENCODING_SIZE), dtype=np.float64)
+        has_face = np.zeros(count, dtype=bool)
+        for i, key in enumerate(keys):
+            encoding = self.entries[key][3]
+            if encoding is not None:
+                encodings[i] = encoding
+                has_face[i] = True
+
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    format=np.int32(CACHE_FORMAT),
+                    model_version=np.str_(self.model_version),
+                    paths=np.array(keys, dtype=str),
+                    sizes=np.array([self.entries[k][0] for k in keys], dtype=np.int64),
+                    mtimes=np.array([self.entries[k][1] for k in keys], dtype=np.int64),
+                    digests=np.array([self.entries[k][2] for k in keys], dtype=str),
+                    encodings=encodings,
+                    has_face=has_face,
+                )
+            os.replace(tmp_path, self.cache_path)
+            self.dirty = False
+            print(f"💾 Saved {count} encodings to cache")
+            return True
+        except Exception as e:
+            print(f"❌ Error saving encoding cache: {e}")
+            return False
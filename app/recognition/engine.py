@@ -0,0 +1,349 @@
+"""
+Recognition Engine
+Detects, encodes and matches faces in camera frames without any GUI dependencies
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .capture import CapturedFrame
+from .detectors import FaceDetector, create_detector
+from .matcher import BatchMatcher, MatchResult
+from .models import Box, FaceModels
+from .motion_gate import MotionGate
+from .roi import detect_in_rois
+from .tracker import FaceTracker, Track
+
+Face = Tuple[Box, Optional[str], float, bool, float]  # (box, name, distance, accepted, confidence)
+
+
+class FrameJob:
+    """A captured frame and everything the recognition stages found in it"""
+
+    __slots__ = ("seq", "timestamp", "frame", "source", "rgb_small", "scale", "locations", "boxes",
+                 "encodings", "results", "tracks", "encode_tracks", "faces", "timings")
+
+    def __init__(self, seq: int, timestamp: float, frame: np.ndarray, source: Optional[str] = None):
+        self.seq = seq  # Sequence number within its source
+        self.timestamp = timestamp  # Seconds: capture time, or the position in a video; tracking runs on it
+        self.frame = frame  # Full-resolution BGR frame
+        self.source = source  # Name of the camera the frame came from
+        self.rgb_small: Optional[np.ndarray] = None
+        self.scale = 1.0
+        self.locations: List[Box] = []  # Face boxes in the downscaled frame
+        self.boxes: List[Box] = []  # Face boxes in the full-resolution frame
+        self.encodings: List[np.ndarray] = []
+        self.results: Optional[MatchResult] = None
+        self.tracks: Optional[List[Track]] = None  # Live tracks when tracking is enabled
+        self.encode_tracks: List[Track] = []  # Tracks whose faces are encoded in this job
+        self.faces: List[Face] = []  # Final per-face outcome
+        self.timings: Dict[str, float] = {}  # Stage name -> seconds
+
+    @classmethod
+    def from_capture(cls, captured: CapturedFrame, source: Optional[str] = None) -> "FrameJob":
+        return cls(captured.seq, captured.timestamp, captured.image, source)
+
+
+class SourceState:
+    """Tracking and motion state for one camera
+
+    Trackers and motion gates follow a single stream, so every camera
+    feeding a shared engine gets its own.
+    """
+
+    __slots__ = ("tracker", "motion_gate", "lock", "last_full_sweep", "detections_in_flight",
+                 "last_detection_seq")
+
+    def __init__(self, tracker: Optional[FaceTracker], motion_gate: Optional[MotionGate]):
+        self.tracker = tracker
+        self.motion_gate = motion_gate
+        self.lock = threading.Lock()  # Guards the tracker and its tracks
+        self.last_full_sweep = 0.0
+        self.detections_in_flight = 0
+        self.last_detection_seq = 0  # Newest frame whose detections were applied to the tracker
+
+    def reset(self):
+        if self.tracker:
+            with self.lock:
+                self.tracker.reset()
+                self.detections_in_flight = 0
+                self.last_detection_seq = 0
+        if self.motion_gate:
+            self.motion_gate.reset()
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        stats = {}
+        if self.tracker:
+            stats["tracker"] = self.tracker.get_stats()
+        if self.motion_gate:
+            stats["motion_gate"] = self.motion_gate.get_stats()
+        return stats
+
+
+class RecognitionEngine:
+    """Runs detection, encoding and matching as separate, thread-safe steps
+
+    Each step takes and returns a FrameJob so the steps can run one after
+    the other or as stages of a pipeline. With a tracker attached, detection
+    only runs on the tracker's schedule and only tracks whose identity is
+    missing or due for re-verification are encoded. With
+    a motion gate attached, detection is skipped while nobody is tracked and
+    the scene is static.
+
+    While faces are tracked, detection only searches windows around them at
+    `roi_scale`, with a full-frame sweep every `full_sweep_interval` seconds
+    to catch newcomers. Set `roi_scale` to None to always scan the full frame.
+
+    Several cameras can share one engine: jobs carry their source name, and
+    each source gets its own copy of the tracker and motion gate. The first
+    source seen uses the instances passed in.
+
+    Detection goes through a detector backend (dlib HOG by default), which
+    can be swapped by assigning `engine.detector`.
+    """
+
+    def __init__(self, matcher: BatchMatcher, scale: float = 0.25, upsample: int = 1,
+                 tracker: Optional[FaceTracker] = None, motion_gate: Optional[MotionGate] = None,
+                 roi_scale: Optional[float] = 0.5, full_sweep_interval: float = 1.0,
+                 detector: Optional[FaceDetector] = None):
+        self.matcher = matcher
+        self.detector = detector or create_detector("hog")
+        self.scale = scale
+        self.upsample = upsample
+        self.tracker = tracker
+        self.motion_gate = motion_gate
+        self.roi_scale = roi_scale
+        self.full_sweep_interval = full_sweep_interval
+        self._sources: Dict[Optional[str], SourceState] = {}
+        self._sources_lock = threading.Lock()
+
+        # Stats
+        self.full_sweeps = 0
+        self.roi_detections = 0
+        self.encoder_calls = 0
+        self._encode_times = deque()  # (time, faces) for the last minute
+        self._encode_lock = threading.Lock()
+
+    def _state(self, source: Optional[str]) -> SourceState:
+        """Get the tracking state for a source, creating it on first use"""
+        state = self._sources.get(source)
+        if state is None:
+            with self._sources_lock:
+                state = self._sources.get(source)
+                if state is None:
+                    first = not self._sources
+                    state = SourceState(
+                        self.tracker if first or self.tracker is None else self.tracker.clone(),
+                        self.motion_gate if first or self.motion_gate is None else self.motion_gate.clone(),
+                    )
+                    self._sources[source] = state
+        return state
+
+    def reset(self):
+        """Forget tracking and background state (e.g. when the camera stops)"""
+        with self._sources_lock:
+            states = list(self._sources.values())
+            self._sources.clear()
+        for state in states:
+            state.reset()
+        SourceState(self.tracker, self.motion_gate).reset()
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get tracker and motion gate statistics, per source when there are several"""
+        stats = SourceState(self.tracker, self.motion_gate).get_stats()
+        stats["detection"] = {"full_sweeps": self.full_sweeps, "roi_detections": self.roi_detections}
+        stats["encoder"] = {"calls": self.encoder_calls, "per_minute": self.encoder_calls_per_minute()}
+        if hasattr(self.detector, "get_stats"):
+            stats["detector"] = self.detector.get_stats()
+        if len(self._sources) > 1:
+            stats["sources"] = {str(source): state.get_stats() for source, state in self._sources.items()}
+        return stats
+
+    def encoder_calls_per_minute(self) -> int:
+        """Count faces encoded in the last 60 seconds"""
+        cutoff = time.time() - 60.0
+        with self._encode_lock:
+            while self._encode_times and self._encode_times[0][0] < cutoff:
+                self._encode_times.popleft()
+            return sum(count for _, count in self._encode_times)
+
+    def _detect_boxes(self, rgb_small: np.ndarray, scale: float) -> Tuple[List[Box], List[Box]]:
+        """Run the face detector, returning (downscaled, full-resolution) boxes"""
+        locations = self.detector.detect(rgb_small, self.upsample)
+        boxes = [
+            (int(top / scale), int(right / scale), int(bottom / scale), int(left / scale))
+            for top, right, bottom, left in locations
+        ]
+        return locations, boxes
+
+    def _plan_detection(self, state: SourceState, now: float) -> Optional[List[Box]]:
+        """Choose between an ROI pass and a full sweep (under the source lock)
+
+        Returns the tracked boxes to search around, or None for a full sweep.
+        """
+        known = [track.box for track in state.tracker.tracks]
+        if known and self.roi_scale and now - state.last_full_sweep < self.full_sweep_interval:
+            self.roi_detections += 1
+            return known
+        self.full_sweeps += 1
+        state.last_full_sweep = now
+        return None
+
+    def _detect_tracked(self, job: FrameJob, small_frame: np.ndarray, scale: float,
+                        known: Optional[List[Box]]) -> List[Box]:
+        """Detect around known tracks, or across the whole frame (no lock held)"""
+        if known is not None:
+            detector = self.detector
+            return detect_in_rois(job.frame, known, lambda rgb: detector.detect(rgb, self.upsample),
+                                  scale=self.roi_scale)
+        job.rgb_small = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+        return self._detect_boxes(job.rgb_small, scale)[1]
+
+    def detect(self, job: FrameJob) -> Optional[FrameJob]:
+        """Find face boxes in a downscaled copy of the frame
+
+        With tracking, returns None for frames older than one already tracked.
+        The source lock is only held to update the tracker, never while the
+        detector runs, so detect workers on one camera do not serialize.
+        While tracks exist, one detection per source is in flight at a time;
+        results older than ones already applied are discarded.
+        """
+        start = time.perf_counter()
+        scale = self.scale
+        small_frame = cv2.resize(job.frame, (0, 0), fx=scale, fy=scale)
+        job.scale = scale
+
+        state = self._state(job.source)
+        tracker, motion_gate = state.tracker, state.motion_gate
+
+        if tracker is None:
+            if motion_gate is None or motion_gate.check(small_frame):
+                job.rgb_small = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+                job.locations, job.boxes = self._detect_boxes(job.rgb_small, scale)
+        else:
+            gray = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY)
+            known = None
+            with state.lock:
+                if job.seq <= tracker.last_seq:
+                    return None
+                tracker.last_seq = job.seq
+                tracker.propagate(gray, scale)
+
+                # The gate sees every frame to keep its background current,
+                # but only vetoes detection while nobody is being tracked
+                run_detection = tracker.needs_detection() and not (tracker.tracks and state.detections_in_flight)
+                if motion_gate:
+                    if run_detection and not tracker.tracks:
+                        run_detection = motion_gate.check(small_frame)
+                    else:
+                        motion_gate.observe(small_frame)
+                if run_detection:
+                    known = self._plan_detection(state, job.timestamp)
+                    state.detections_in_flight += 1
+
+            boxes = None
+            if run_detection:
+                try:
+                    boxes = self._detect_tracked(job, small_frame, scale, known)
+                finally:
+                    with state.lock:
+                        state.detections_in_flight -= 1
+
+            roi_pass = False
+            with state.lock:
+                if boxes is not None and job.seq > state.last_detection_seq:
+                    state.last_detection_seq = job.seq
+                    tracker.update(boxes, job.timestamp)
+                    roi_pass = known is not None
+                job.tracks = list(tracker.tracks)
+                job.encode_tracks = tracker.tracks_to_encode(job.timestamp)
+                for track in job.encode_tracks:
+                    track.mark_pending(job.timestamp)
+
+            if job.encode_tracks:
+                if roi_pass and self.roi_scale > scale:
+                    # Encode faces found by an ROI pass at the ROI resolution, not from
+                    # the coarser sweep frame; small distant faces need the pixels
+                    scale = self.roi_scale
+                    job.rgb_small = cv2.cvtColor(cv2.resize(job.frame, (0, 0), fx=scale, fy=scale),
+                                                 cv2.COLOR_BGR2RGB)
+                    job.scale = scale
+                elif job.rgb_small is None:
+                    job.rgb_small = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+                height, width = job.rgb_small.shape[:2]
+                job.boxes = [track.box for track in job.encode_tracks]
+                job.locations = [
+                    (max(int(top * scale), 0), min(int(right * scale), width),
+                     min(int(bottom * scale), height), max(int(left * scale), 0))
+                    for top, right, bottom, left in job.boxes
+                ]
+
+        job.timings["detect"] = time.perf_counter() - start
+        return job
+
+    def encode(self, job: FrameJob) -> FrameJob:
+        """Compute an encoding for every face that needs one"""
+        start = time.perf_counter()
+        if job.locations:
+            job.encodings = FaceModels.get().face_encodings(job.rgb_small, job.locations)
+            with self._encode_lock:
+                self.encoder_calls += len(job.locations)
+                self._encode_times.append((time.time(), len(job.locations)))
+        job.timings["encode"] = time.perf_counter() - start
+        return job
+
+    def associate(self, job: FrameJob) -> FrameJob:
+        """Attach tracks to a job whose boxes and encodings were computed elsewhere
+
+        Used for frames from worker processes, which detect and encode every
+        face: the boxes update the source's tracker like a detection, and each
+        encoding becomes a vote for its track, so match() applies the same
+        K-of-M voting as in-process recognition.
+        """
+        state = self._state(job.source)
+        if state.tracker is None:
+            return job
+        with state.lock:
+            state.tracker.update(job.boxes, job.timestamp)
+            by_box = {track.box: track for track in state.tracker.tracks}
+            pairs = [(by_box[tuple(box)], encoding) for box, encoding in zip(job.boxes, job.encodings)
+                     if tuple(box) in by_box]
+            job.tracks = list(state.tracker.tracks)
+            job.encode_tracks = [track for track, _ in pairs]
+            job.encodings = [encoding for _, encoding in pairs]
+        return job
+
+    def match(self, job: FrameJob) -> FrameJob:
+        """Match every encoded face to its closest student at once"""
+        start = time.perf_counter()
+        job.results = self.matcher.match_students(job.encodings)
+
+        if job.tracks is None:
+            # Without tracks there is nothing to vote across, so one frame decides
+            tolerance = self.matcher.tolerance
+            job.faces = [(box, name, distance, accepted,
+                          max(1.0 - distance / tolerance, 0.0) if accepted and tolerance > 0 else 0.0)
+                         for box, (name, distance, accepted) in zip(job.boxes, job.results)]
+        else:
+            # Votes change tracks the detect stage updates, so hold the source lock
+            state = self._state(job.source)
+            with state.lock:
+                for track, (name, distance, accepted) in zip(job.encode_tracks, job.results):
+                    track.record_vote(name, distance, accepted, self.matcher.tolerance, job.timestamp)
+                job.faces = [(track.box, track.name, track.distance, track.accepted, track.confidence)
+                             for track in job.tracks if track.identified]
+
+        job.timings["match"] = time.perf_counter() - start
+        return job
+
+    def process(self, job: FrameJob) -> Optional[FrameJob]:
+        """Run every step on a single thread"""
+        job = self.detect(job)
+        if job is None:
+            return None
+        return self.match(self.encode(job))
@@ -0,0 +1,146 @@
+"""
+Enrollment Pipeline
+Encodes the student gallery across a pool of worker processes
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .encoding_cache import EncodingCache, hash_file
+from .gallery import FaceGallery
+
+
+class EnrollmentResult:
+    """Outcome of encoding a single gallery image"""
+
+    __slots__ = ("path", "encoding", "digest", "error")
+
+    def __init__(self, path, encoding: Optional[np.ndarray] = None,
+                 digest: Optional[str] = None, error: Optional[str] = None):
+        self.path = path
+        self.encoding = encoding
+        self.digest = digest
+        self.error = error
+
+    @property
+    def has_face(self) -> bool:
+        return self.encoding is not None
+
+
+def list_gallery_images(students_dir) -> List[Tuple[str, Path]]:
+    """List (student, image path) pairs in gallery order"""
+    students_dir = Path(students_dir)
+    images = []
+    for student in os.listdir(students_dir):
+        folder = students_dir / student
+        if not folder.is_dir():
+            continue
+        for file in os.listdir(folder):
+            images.append((student, folder / file))
+    return images
+
+
+def _init_worker():
+    """Keep each worker on a single OpenCV thread to avoid oversubscription"""
+    import cv2
+    cv2.setNumThreads(1)
+
+
+def encode_image(path) -> EnrollmentResult:
+    """Decode an image and compute the encoding of its first face"""
+    import cv2
+    import face_recognition
+
+    try:
+        digest = hash_file(path)
+        img = cv2.imread(str(path))
+        if img is None:
+            return EnrollmentResult(path, digest=digest, error="could not decode image")
+
+        rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        encs = face_recognition.face_encodings(rgb)
+        return EnrollmentResult(path, encs[0] if encs else None, digest)
+    except Exception as e:
+        return EnrollmentResult(path, error=str(e))
+
+
+class EnrollmentEngine:
+    """Process-pool engine that encodes gallery images in parallel
+
+    Results are streamed back in the same order as the input paths, so the
+    output matches the serial path exactly.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunksize: int = 4):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.failures: List[EnrollmentResult] = []
+
+    def encode(self, paths: Sequence) -> Iterator[EnrollmentResult]:
+        """Encode images, yielding results in input order"""
+        self.failures = []
+        workers = min(self.workers, len(paths))
+
+        if workers <= 1:
+            for result in map(encode_image, paths):
+                yield self._check(result)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            for result in pool.map(encode_image, paths, chunksize=self.chunksize):
+                yield self._check(result)
+
+    def _check(self, result: EnrollmentResult) -> EnrollmentResult:
+        """Record and report per-image failures"""
+        if result.error:
+            self.failures.append(result)
+            print(f"❌ Failed to encode {result.path}: {result.error}")
+        elif not result.has_face:
+            self.failures.append(result)
+            print(f"⚠️  No face found in {result.path}")
+        return result
+
+
+def enroll_gallery(students_dir, cache: Optional[EncodingCache] = None,
+                   workers: Optional[int] = None) -> FaceGallery:
+    """Build the face gallery for a students directory
+
+    Cached images are loaded directly; only misses are sent to the pool.
+    """
+    images = list_gallery_images(students_dir)
+    encodings: List[Optional[np.ndarray]] = [None] * len(images)
+    pending = []
+
+    for i, (_, path) in enumerate(images):
+        found = False
+        if cache is not None:
+            found, encodings[i] = cache.lookup(path)
+        if not found:
+            pending.append(i)
+
+    if pending:
+        engine = EnrollmentEngine(workers)
+        print(f"🔄 Encoding {len(pending)} images with {min(engine.workers, len(pending))} workers")
+        results = engine.encode([images[i][1] for i in pending])
+        for i, result in zip(pending, results):
+            encodings[i] = result.encoding
+            # Undecodable and faceless images are cached as None so they are not
+            # re-read every launch; a digest means the file itself was read
+            if cache is not None and result.digest is not None:
+                cache.store(result.path, result.encoding, result.digest)
+        if engine.failures:
+            print(f"⚠️  {len(engine.failures)} images could not be enrolled")
+
+    if cache is not None:
+        cache.prune(path for _, path in images)
+        cache.save()
+
+    gallery = FaceGallery(capacity=sum(encoding is not None for encoding in encodings))
+    for (student, _), encoding in zip(images, encodings):
+        if encoding is not None:
+            gallery.append(student.upper(), encoding)
+    return gallery
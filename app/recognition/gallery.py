@@ -0,0 +1,153 @@
+"""
+Face Gallery
+Stores known face encodings as one contiguous float32 matrix with integer labels
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .encoding_cache import ENCODING_SIZE
+
+
+class FaceGallery:
+    """Contiguous gallery of known face encodings
+
+    Rows live in a preallocated N x 128 float32 matrix. Each row carries an
+    int32 label indexing into a separate name table. Removed rows are marked
+    with label -1 until the gallery is compacted.
+    """
+
+    def __init__(self, capacity: int = 256, dim: int = ENCODING_SIZE):
+        self.dim = dim
+        self._matrix = np.zeros((max(capacity, 1), dim), dtype=np.float32)
+        self._labels = np.full(max(capacity, 1), -1, dtype=np.int32)
+        self.size = 0  # Rows in use, including removed rows awaiting compaction
+        self.removed_rows = 0
+        self.names: List[Optional[str]] = []  # Label -> name (None once removed)
+        self._name_index: Dict[str, int] = {}
+        self.version = 0  # Bumped on every change
+        self.layout_version = 0  # Bumped when existing rows move
+
+    @classmethod
+    def from_encodings(cls, encodings: Iterable, names: Iterable[str]) -> "FaceGallery":
+        """Build a gallery from parallel lists of encodings and names"""
+        encodings = list(encodings)
+        names = list(names)
+        gallery = cls(capacity=len(encodings))
+        for name, encoding in zip(names, encodings):
+            gallery.append(name, encoding)
+        return gallery
+
+    def __len__(self) -> int:
+        return self.size - self.removed_rows
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """View of the rows in use (removed rows included until compaction)"""
+        return self._matrix[:self.size]
+
+    @property
+    def labels(self) -> np.ndarray:
+        """View of the row labels (-1 for removed rows)"""
+        return self._labels[:self.size]
+
+    @property
+    def num_students(self) -> int:
+        return len(self._name_index)
+
+    @property
+    def nbytes(self) -> int:
+        return self._matrix.nbytes + self._labels.nbytes
+
+    def label_for(self, name: str) -> Optional[int]:
+        """Get the label assigned to a student name"""
+        return self._name_index.get(name)
+
+    def name_of(self, label: int) -> Optional[str]:
+        """Get the student name for a label"""
+        if 0 <= label < len(self.names):
+            return self.names[label]
+        return None
+
+    def _ensure_capacity(self, needed: int):
+        """Grow the preallocated storage to hold at least `needed` rows"""
+        capacity = len(self._matrix)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        matrix[:self.size] = self._matrix[:self.size]
+        labels = np.full(capacity, -1, dtype=np.int32)
+        labels[:self.size] = self._labels[:self.size]
+        self._matrix, self._labels = matrix, labels
+
+    def _get_or_create_label(self, name: str) -> int:
+        label = self._name_index.get(name)
+        if label is None:
+            label = len(self.names)
+            self.names.append(name)
+            self._name_index[name] = label
+        return label
+
+    def append(self, name: str, encoding) -> int:
+        """Append one encoding for a student, returning its row index"""
+        return self.extend(name, np.asarray(encoding).reshape(1, self.dim))
+
+    def extend(self, name: str, encodings) -> int:
+        """Append several encodings for one student, returning the first row index"""
+        encodings = np.asarray(encodings, dtype=np.float32).reshape(-1, self.dim)
+        start = self.size
+        self._ensure_capacity(start + len(encodings))
+        self._matrix[start:start + len(encodings)] = encodings
+        self._labels[start:start + len(encodings)] = self._get_or_create_label(name)
+        self.size += len(encodings)
+        self.version += 1
+        return start
+
+    def remove(self, name: str) -> int:
+        """Remove every encoding of a student, returning the number of rows removed"""
+        label = self._name_index.pop(name, None)
+        if label is None:
+            return 0
+
+        rows = self.labels == label
+        count = int(rows.sum())
+        self._labels[:self.size][rows] = -1
+        self.names[label] = None
+        self.removed_rows += count
+        self.version += 1
+        return count
+
+    def compact(self):
+        """Drop removed rows and unused labels so storage is contiguous again"""
+        if not self.removed_rows and len(self.names) == len(self._name_index):
+            return
+
+        keep = self.labels >= 0
+        remap = np.full(len(self.names) + 1, -1, dtype=np.int32)
+        names = []
+        for label, name in enumerate(self.names):
+            if name is not None:
+                remap[label] = len(names)
+                names.append(name)
+
+        count = int(keep.sum())
+        self._matrix[:count] = self._matrix[:self.size][keep]
+        self._labels[:count] = remap[self._labels[:self.size][keep]]
+        self._labels[count:self.size] = -1
+        self.size = count
+        self.removed_rows = 0
+        self.names = names
+        self._name_index = {name: label for label, name in enumerate(names)}
+        self.version += 1
+        self.layout_version += 1
+
+    def encodings_for(self, name: str) -> np.ndarray:
+        """Get a copy of every encoding enrolled for a student"""
+        label = self._name_index.get(name)
+        if label is None:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return self.matrix[self.labels == label].copy()
@@ -0,0 +1,281 @@
+"""
+Batch Matcher
+Matches every face in a frame against the gallery in one vectorized pass
+"""
+
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .ann_index import IVFIndex, gallery_fingerprint
+from .gallery import FaceGallery
+
+DEFAULT_TOLERANCE = 0.6
+ANN_THRESHOLD = 20000  # Galleries with at least this many rows use the IVF index
+ANN_CANDIDATES = 8  # Neighbours fetched per face so removed rows can be skipped
+ANN_STUDENT_CANDIDATES = 32  # Neighbours fetched per face for student-level matching
+
+
+class MatchResult:
+    """Per-face outcome of matching a batch of encodings"""
+
+    __slots__ = ("labels", "distances", "accepted", "names")
+
+    def __init__(self, labels: np.ndarray, distances: np.ndarray, accepted: np.ndarray,
+                 names: List[Optional[str]]):
+        self.labels = labels  # Best label per face (-1 when the gallery is empty)
+        self.distances = distances  # Distance to the best match
+        self.accepted = accepted  # True when the best match is within tolerance
+        self.names = names  # Matched name per face (None when rejected)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __iter__(self) -> Iterator[Tuple[Optional[str], float, bool]]:
+        for i in range(len(self.labels)):
+            yield self.names[i], float(self.distances[i]), bool(self.accepted[i])
+
+
+class StudentMatchResult(MatchResult):
+    """Per-face outcome of student-level matching, with the top-k students"""
+
+    __slots__ = ("top_labels", "top_distances", "margins")
+
+    def __init__(self, top_labels: np.ndarray, top_distances: np.ndarray, margins: np.ndarray,
+                 accepted: np.ndarray, names: List[Optional[str]]):
+        super().__init__(top_labels[:, 0], top_distances[:, 0], accepted, names)
+        self.top_labels = top_labels  # M x k student labels, best first (-1 padded)
+        self.top_distances = top_distances  # M x k aggregated distances (inf padded)
+        self.margins = margins  # Rank-2 minus rank-1 distance per face
+
+
+class BatchMatcher:
+    """Gallery matcher for whole frames
+
+    Small galleries are scanned exactly with a single GEMM. Galleries with at
+    least `ann_threshold` rows are searched through an IVF index instead.
+
+    Student-level matching reduces row distances per label ("min" or "mean")
+    and rejects a face when the rank-2 student is within `margin` of rank-1.
+    """
+
+    def __init__(self, gallery: FaceGallery, tolerance: float = DEFAULT_TOLERANCE,
+                 margin: float = 0.0, reduce: str = "min", index_path=None,
+                 ann_threshold: int = ANN_THRESHOLD, nprobe: int = 8):
+        if reduce not in ("min", "mean"):
+            raise ValueError(f"Unknown reduction: {reduce}")
+        self.gallery = gallery
+        self.tolerance = tolerance
+        self.margin = margin
+        self.reduce = reduce
+        self.index_path = index_path
+        self.ann_threshold = ann_threshold
+        self.nprobe = nprobe
+        self.index: Optional[IVFIndex] = None
+        self._indexed_rows = 0
+        self._index_layout = None
+        self._version = None
+        self._sq_norms = None
+        self._removed = None
+        self._segment_version = None
+        self._segment_order = None
+        self._segment_starts = None
+        self._segment_labels = None
+        self._segment_counts = None
+
+    @property
+    def uses_index(self) -> bool:
+        return len(self.gallery) >= self.ann_threshold
+
+    def prepare(self):
+        """Build or load the ANN index ahead of time when the gallery needs one"""
+        if self.uses_index:
+            self._sync_index()
+
+    def _sync_index(self):
+        """Keep the IVF index in step with the gallery
+
+        Appended rows are inserted incrementally; compaction moves rows, so it
+        forces a rebuild. A saved index is reused when its fingerprint matches.
+        """
+        if self.index is not None and self._index_layout == self.gallery.layout_version:
+            if self.gallery.size > self._indexed_rows:
+                new_rows = np.arange(self._indexed_rows, self.gallery.size)
+                self.index.add(self.gallery.matrix[self._indexed_rows:], new_rows)
+                self._indexed_rows = self.gallery.size
+            return
+
+        matrix = self.gallery.matrix
+        fingerprint = gallery_fingerprint(matrix)
+        index = IVFIndex.load(self.index_path) if self.index_path else None
+        if index is None or index.fingerprint != fingerprint:
+            print(f"🔄 Building ANN index for {len(matrix)} encodings...")
+            index = IVFIndex(nprobe=self.nprobe, dim=self.gallery.dim)
+            index.build(matrix)
+            index.fingerprint = fingerprint
+            if self.index_path:
+                index.save(self.index_path)
+
+        index.nprobe = self.nprobe
+        self.index = index
+        self._indexed_rows = self.gallery.size
+        self._index_layout = self.gallery.layout_version
+
+    def _refresh(self):
+        """Recompute cached gallery norms when the gallery changes"""
+        if self._version == self.gallery.version:
+            return
+        matrix = self.gallery.matrix
+        self._sq_norms = np.einsum("ij,ij->i", matrix, matrix)
+        self._removed = self.gallery.labels < 0
+        self._version = self.gallery.version
+
+    @staticmethod
+    def _as_batch(encodings, dim: int) -> np.ndarray:
+        return np.asarray(encodings, dtype=np.float32).reshape(-1, dim)
+
+    def distance_matrix(self, encodings) -> np.ndarray:
+        """Get the M x N Euclidean distances between faces and gallery rows
+
+        Uses |q|^2 + |g|^2 - 2 q.g so the work is one matrix product.
+        Removed gallery rows get an infinite distance.
+        """
+        self._refresh()
+        queries = self._as_batch(encodings, self.gallery.dim)
+        sq_dist = queries @ self.gallery.matrix.T
+        sq_dist *= -2.0
+        sq_dist += np.einsum("ij,ij->i", queries, queries)[:, None]
+        sq_dist += self._sq_norms[None, :]
+        np.maximum(sq_dist, 0.0, out=sq_dist)
+        distances = np.sqrt(sq_dist, out=sq_dist)
+        distances[:, self._removed] = np.inf
+        return distances
+
+    def match(self, encodings) -> MatchResult:
+        """Find the best gallery match for every face in a frame"""
+        queries = self._as_batch(encodings, self.gallery.dim)
+        count = len(queries)
+
+        if count == 0 or self.gallery.size == 0:
+            return MatchResult(
+                np.full(count, -1, dtype=np.int32),
+                np.full(count, np.inf, dtype=np.float32),
+                np.zeros(count, dtype=bool),
+                [None] * count,
+            )
+
+        if self.uses_index:
+            best_rows, best_distances = self._search_index(queries)
+        else:
+            distances = self.distance_matrix(queries)
+            best_rows = np.argmin(distances, axis=1)
+            best_distances = distances[np.arange(count), best_rows]
+        labels = np.where(best_rows >= 0, self.gallery.labels[best_rows], -1)
+        accepted = (best_distances <= self.tolerance) & (labels >= 0)
+        names = [self.gallery.name_of(int(label)) if ok else None
+                 for label, ok in zip(labels, accepted)]
+        return MatchResult(labels, best_distances, accepted, names)
+
+    def _search_index(self, queries: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the nearest live gallery row per face from the IVF index"""
+        self._sync_index()
+        distances, rows = self.index.search(queries, k=ANN_CANDIDATES)
+
+        # Skip candidates whose rows were removed from the gallery
+        live = (rows >= 0) & (self.gallery.labels[np.maximum(rows, 0)] >= 0)
+        first = np.argmax(live, axis=1)
+        found = live[np.arange(len(rows)), first]
+        best_rows = np.where(found, rows[np.arange(len(rows)), first], -1)
+        best_distances = np.where(found, distances[np.arange(len(rows)), first], np.inf)
+        return best_rows, best_distances
+
+    def _refresh_segments(self):
+        """Group live gallery rows by label so they can be reduced per student"""
+        if self._segment_version == self.gallery.version:
+            return
+        labels = self.gallery.labels
+        order = np.argsort(labels, kind="stable")
+        order = order[labels[order] >= 0]
+        sorted_labels = labels[order]
+        starts = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1]]) if len(order) \
+            else np.empty(0, dtype=np.intp)
+
+        self._segment_order = order
+        self._segment_starts = starts
+        self._segment_labels = sorted_labels[starts]
+        self._segment_counts = np.diff(np.r_[starts, len(order)])
+        self._segment_version = self.gallery.version
+
+    def student_distances(self, encodings, reduce: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the M x S per-student distances and the label of each column
+
+        Row distances are reduced per label with one segmented ufunc call.
+        """
+        reduce = reduce or self.reduce
+        self._refresh_segments()
+        distances = self.distance_matrix(encodings)[:, self._segment_order]
+        if reduce == "min":
+            student = np.minimum.reduceat(distances, self._segment_starts, axis=1)
+        else:
+            student = np.add.reduceat(distances, self._segment_starts, axis=1) / self._segment_counts
+        return student, self._segment_labels
+
+    def match_students(self, encodings, k: int = 3, margin: Optional[float] = None,
+                       reduce: Optional[str] = None) -> StudentMatchResult:
+        """Find the top-k students for every face in a frame
+
+        A face is accepted when its best student is within tolerance and at
+        least `margin` closer than the runner-up.
+        """
+        margin = self.margin if margin is None else margin
+        queries = self._as_batch(encodings, self.gallery.dim)
+        count = len(queries)
+        k = max(k, 2)
+        top_labels = np.full((count, k), -1, dtype=np.int32)
+        top_distances = np.full((count, k), np.inf, dtype=np.float32)
+
+        if count and len(self.gallery):
+            if self.uses_index:
+                self._top_students_from_index(queries, reduce or self.reduce, top_labels, top_distances)
+            else:
+                student, labels = self.student_distances(queries, reduce)
+                top = min(k, student.shape[1])
+                nearest = np.argpartition(student, top - 1, axis=1)[:, :top] if top < student.shape[1] \
+                    else np.broadcast_to(np.arange(top), (count, top))
+                nearest_distances = np.take_along_axis(student, nearest, axis=1)
+                ranked = np.argsort(nearest_distances, axis=1)
+                top_labels[:, :top] = labels[np.take_along_axis(nearest, ranked, axis=1)]
+                top_distances[:, :top] = np.take_along_axis(nearest_distances, ranked, axis=1)
+
+        with np.errstate(invalid="ignore"):
+            margins = top_distances[:, 1] - top_distances[:, 0]
+        accepted = (top_labels[:, 0] >= 0) & (top_distances[:, 0] <= self.tolerance) & (margins >= margin)
+        names = [self.gallery.name_of(int(label)) if ok else None
+                 for label, ok in zip(top_labels[:, 0], accepted)]
+        return StudentMatchResult(top_labels, top_distances, margins, accepted, names)
+
+    def _top_students_from_index(self, queries: np.ndarray, reduce: str,
+                                 top_labels: np.ndarray, top_distances: np.ndarray):
+        """Fill the top-k students per face from IVF candidates
+
+        Only retrieved rows take part, so "mean" averages over a student's
+        retrieved photos rather than all of them.
+        """
+        self._sync_index()
+        distances, rows = self.index.search(queries, k=ANN_STUDENT_CANDIDATES)
+        row_labels = np.where(rows >= 0, self.gallery.labels[np.maximum(rows, 0)], -1)
+        k = top_labels.shape[1]
+
+        for i in range(len(queries)):
+            live = row_labels[i] >= 0
+            labels, inverse = np.unique(row_labels[i][live], return_inverse=True)
+            if not len(labels):
+                continue
+            if reduce == "min":
+                student = np.full(len(labels), np.inf, dtype=np.float32)
+                np.minimum.at(student, inverse, distances[i][live])
+            else:
+                student = np.bincount(inverse, weights=distances[i][live]) / np.bincount(inverse)
+            ranked = np.argsort(student)[:k]
+            top_labels[i, :len(ranked)] = labels[ranked]
+            top_distances[i, :len(ranked)] = student[ranked]
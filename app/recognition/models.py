@@ -0,0 +1,56 @@
+"""
+Face Models
+Per-thread dlib models for face detection and encoding
+"""
+
+import threading
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+Box = Tuple[int, int, int, int]  # (top, right, bottom, left), as used by face_recognition
+
+
+class FaceModels:
+    """dlib detector, landmark predictor and encoder owned by a single thread
+
+    dlib detectors and networks are not safe to call concurrently, so every
+    worker thread gets its own instances through `FaceModels.get()`. Results
+    match `face_recognition.face_locations` / `face_encodings` exactly.
+    """
+
+    _local = threading.local()
+
+    @classmethod
+    def get(cls) -> "FaceModels":
+        """Get the models for the calling thread, loading them on first use"""
+        models = getattr(cls._local, "models", None)
+        if models is None:
+            models = cls()
+            cls._local.models = models
+        return models
+
+    def __init__(self):
+        import dlib
+        import face_recognition_models
+
+        self._dlib = dlib
+        self.detector = dlib.get_frontal_face_detector()
+        self.pose_predictor = dlib.shape_predictor(face_recognition_models.pose_predictor_five_point_model_location())
+        self.encoder = dlib.face_recognition_model_v1(face_recognition_models.face_recognition_model_location())
+
+    def face_locations(self, rgb: np.ndarray, upsample: int = 1) -> List[Box]:
+        """Detect faces with the HOG detector"""
+        height, width = rgb.shape[:2]
+        return [
+            (max(rect.top(), 0), min(rect.right(), width), min(rect.bottom(), height), max(rect.left(), 0))
+            for rect in self.detector(rgb, upsample)
+        ]
+
+    def face_encodings(self, rgb: np.ndarray, locations: Sequence[Box], num_jitters: int = 1) -> List[np.ndarray]:
+        """Compute 128-d encodings for the given face boxes"""
+        encodings = []
+        for top, right, bottom, left in locations:
+            shape = self.pose_predictor(rgb, self._dlib.rectangle(left, top, right, bottom))
+            encodings.append(np.array(self.encoder.compute_face_descriptor(rgb, shape, num_jitters)))
+        return encodings
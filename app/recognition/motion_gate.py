@@ -0,0 +1,93 @@
+"""
+Motion Gate
+Skips face detection while the scene is static
+"""
+
+import threading
+import time
+from typing import Dict
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Frame-differencing gate against a running-average background model
+
+    Frames are reduced to a small blurred grayscale image and compared with
+    the background. Detection is allowed when enough pixels changed, or at
+    least every `max_idle_seconds` so a motionless face is still found.
+    """
+
+    def __init__(self, width: int = 160, pixel_threshold: int = 25, min_changed_ratio: float = 0.005,
+                 learning_rate: float = 0.05, max_idle_seconds: float = 5.0):
+        self.width = width
+        self.pixel_threshold = pixel_threshold  # Grey-level change that counts as motion
+        self.min_changed_ratio = min_changed_ratio  # Fraction of changed pixels needed to pass
+        self.learning_rate = learning_rate
+        self.max_idle_seconds = max_idle_seconds
+        self._background = None
+        self._last_pass = 0.0
+        self._lock = threading.Lock()
+
+        # Stats
+        self.checked = 0
+        self.skipped = 0
+        self.last_changed_ratio = 0.0
+
+    def set_sensitivity(self, sensitivity: float):
+        """Set sensitivity from 0 (least) to 1 (most) by scaling the thresholds"""
+        sensitivity = min(max(sensitivity, 0.0), 1.0)
+        self.pixel_threshold = int(45 - 35 * sensitivity)
+        self.min_changed_ratio = 0.02 * (1.0 - sensitivity) + 0.001
+
+    def clone(self) -> "MotionGate":
+        """Create a gate with the same settings and no background (e.g. for another camera)"""
+        return MotionGate(self.width, self.pixel_threshold, self.min_changed_ratio,
+                          self.learning_rate, self.max_idle_seconds)
+
+    def reset(self):
+        with self._lock:
+            self._background = None
+            self._last_pass = 0.0
+
+    def _update(self, frame: np.ndarray) -> float:
+        """Blend a BGR frame into the background, returning the fraction of changed pixels"""
+        height, width = frame.shape[:2]
+        size = (self.width, max(int(height * self.width / width), 1))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA) if width > self.width else frame
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+
+        if self._background is None or self._background.shape != gray.shape:
+            self._background = gray.astype(np.float32)
+            return 1.0
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self._background))
+        cv2.accumulateWeighted(gray, self._background, self.learning_rate)
+        return float(np.count_nonzero(diff > self.pixel_threshold)) / diff.size
+
+    def observe(self, frame: np.ndarray):
+        """Keep the background current on frames where no decision is needed"""
+        with self._lock:
+            self._update(frame)
+
+    def check(self, frame: np.ndarray) -> bool:
+        """Update the background with a BGR frame and return True if detection should run"""
+        with self._lock:
+            self.checked += 1
+            now = time.time()
+            self.last_changed_ratio = self._update(frame)
+
+            if self.last_changed_ratio >= self.min_changed_ratio or now - self._last_pass >= self.max_idle_seconds:
+                self._last_pass = now
+                return True
+            self.skipped += 1
+            return False
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "checked": self.checked,
+            "skipped": self.skipped,
+            "skip_ratio": self.skipped / self.checked if self.checked else 0.0,
+            "changed_ratio": round(self.last_changed_ratio, 4),
+        }
@@ -0,0 +1,242 @@
+"""
+Multi-Camera Capture
+Opens several capture sources and keeps per-camera frame rate and latency stats
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+from urllib.parse import urlsplit, urlunsplit
+
+import cv2
+
+from .capture import FrameGrabber
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+Source = Union[int, str]
+
+
+def parse_source(spec) -> Source:
+    """Turn a source spec into a device index, or keep it as a file path / URL"""
+    if isinstance(spec, int):
+        return spec
+    spec = str(spec).strip()
+    return int(spec) if spec.isdigit() else spec
+
+
+def describe_source(source: Source) -> str:
+    """Get a printable label for a source, hiding any URL credentials"""
+    if isinstance(source, int):
+        return f"device {source}"
+    parts = urlsplit(source)
+    if parts.scheme and "@" in parts.netloc:
+        parts = parts._replace(netloc=parts.netloc.rsplit("@", 1)[1])
+        return urlunsplit(parts)
+    return source
+
+
+class ImageFolderCapture:
+    """cv2.VideoCapture stand-in that plays a folder of images at a fixed rate
+
+    Useful for testing multi-camera setups without camera hardware.
+    """
+
+    def __init__(self, folder, fps: float = 10.0, loop: bool = True):
+        self.paths = sorted(
+            path for path in Path(folder).iterdir() if path.suffix.lower() in IMAGE_EXTENSIONS
+        )
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        self.loop = loop
+        self._index = 0
+        self._next_time = 0.0
+        self._opened = bool(self.paths)
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def read(self):
+        if not self._opened:
+            return False, None
+        if self._index >= len(self.paths):
+            if not self.loop:
+                return False, None
+            self._index = 0
+
+        delay = self._next_time - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        self._next_time = time.time() + self.interval
+
+        image = cv2.imread(str(self.paths[self._index]))
+        self._index += 1
+        return image is not None, image
+
+    def release(self):
+        self._opened = False
+
+
+class PacedCapture:
+    """Wraps a video file capture so it plays at its own frame rate, optionally looping
+
+    Without pacing, a capture thread would decode a file as fast as possible
+    and drop almost every frame.
+    """
+
+    def __init__(self, cap, fps: Optional[float] = None, loop: bool = True):
+        self.cap = cap
+        fps = fps or cap.get(cv2.CAP_PROP_FPS) or 25.0
+        self.interval = 1.0 / fps
+        self.loop = loop
+        self._next_time = 0.0
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def read(self):
+        delay = self._next_time - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        self._next_time = time.time() + self.interval
+
+        ret, image = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, image = self.cap.read()
+        return ret, image
+
+    def release(self):
+        self.cap.release()
+
+
+def open_capture(source: Source):
+    """Open a device index, image folder, video file or stream URL"""
+    if isinstance(source, int):
+        return cv2.VideoCapture(source)
+    if Path(source).is_dir():
+        return ImageFolderCapture(source)
+    if Path(source).is_file():
+        return PacedCapture(cv2.VideoCapture(source))
+    return cv2.VideoCapture(source)
+
+
+class CameraSource:
+    """One capture source, its frame grabber and its recognition stats"""
+
+    def __init__(self, spec, name: Optional[str] = None):
+        self.source = parse_source(spec)
+        self.name = name or "camera"
+        self.label = describe_source(self.source)
+        self.cap = None
+        self.grabber: Optional[FrameGrabber] = None
+        self.skip_count = 0  # Frames since the last one sent for recognition
+
+        # Stats
+        self.frames_processed = 0
+        self.faces_seen = 0
+        self.latency = 0.0  # EMA of capture-to-result seconds
+        self._fps = 0.0
+        self._last_result = None
+
+    def open(self) -> bool:
+        """Open the source and start its capture thread"""
+        self.cap = open_capture(self.source)
+        if not self.cap.isOpened():
+            self.cap.release()
+            self.cap = None
+            return False
+        self.grabber = FrameGrabber(self.cap, name=self.name)
+        self.grabber.start()
+        return True
+
+    def close(self):
+        """Stop the capture thread and release the source"""
+        if self.grabber:
+            self.grabber.stop()
+            self.grabber = None
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+
+    def record(self, timestamp: float, faces: int):
+        """Record a processed frame captured at `timestamp`"""
+        now = time.time()
+        alpha = 0.1 if self.frames_processed else 1.0
+        self.latency += alpha * (now - timestamp - self.latency)
+        if self._last_result is not None and now > self._last_result:
+            rate = 1.0 / (now - self._last_result)
+            self._fps = 0.9 * self._fps + 0.1 * rate if self._fps else rate
+        self._last_result = now
+        self.frames_processed += 1
+        self.faces_seen += faces
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get processing FPS, latency and capture statistics for this camera"""
+        stats = {
+            "source": self.label,
+            "frames_processed": self.frames_processed,
+            "faces_seen": self.faces_seen,
+            "fps": round(self._fps, 1),
+            "latency_ms": round(self.latency * 1000, 1),
+        }
+        if self.grabber:
+            stats.update(self.grabber.get_stats())
+        return stats
+
+
+class CameraManager:
+    """Opens N capture sources that feed one shared recognition engine
+
+    Sources can be device indices, video files, image folders or stream URLs.
+    Sources that fail to open are skipped; opening fails only if none open.
+    """
+
+    def __init__(self, specs: Sequence = (0,)):
+        self.cameras = [CameraSource(spec, f"camera{i}") for i, spec in enumerate(specs)]
+        self._by_name = {}
+
+    def __len__(self) -> int:
+        return len(self.cameras)
+
+    def __iter__(self):
+        return iter(self.cameras)
+
+    @property
+    def primary(self) -> Optional[CameraSource]:
+        """The first camera that opened, shown in the preview"""
+        return self.cameras[0] if self.cameras else None
+
+    def open(self) -> bool:
+        """Open every source, returning True if at least one opened"""
+        opened = []
+        for camera in self.cameras:
+            if camera.open():
+                print(f"📷 Opened {camera.name} ({camera.label})")
+                opened.append(camera)
+            else:
+                print(f"⚠️  Could not open {camera.name} ({camera.label})")
+        self.cameras = opened
+        self._by_name = {camera.name: camera for camera in opened}
+        return bool(opened)
+
+    def get(self, name: str) -> Optional[CameraSource]:
+        return self._by_name.get(name)
+
+    def record(self, name: str, timestamp: float, faces: int = 0):
+        """Record a processed frame for the camera it came from"""
+        camera = self._by_name.get(name)
+        if camera:
+            camera.record(timestamp, faces)
+
+    def stop(self):
+        """Stop and release every source"""
+        for camera in self.cameras:
+            stats = camera.get_stats()
+            print(f"📷 {camera.name}: captured {stats.get('frames_captured', 0)} frames, "
+                  f"dropped {stats.get('frames_dropped', 0)} stale frames, "
+                  f"processed {stats['frames_processed']}")
+            camera.close()
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get per-camera statistics keyed by camera name"""
+        return {camera.name: camera.get_stats() for camera in self.cameras}
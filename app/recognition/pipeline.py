@@ -0,0 +1,198 @@
+"""
+Recognition Pipeline
+Runs recognition steps as stages connected by bounded drop-oldest queues
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class DropOldestQueue:
+    """Bounded queue that discards its oldest item instead of blocking producers"""
+
+    def __init__(self, maxsize: int = 2):
+        self.maxsize = max(maxsize, 1)
+        self._items = deque()
+        self._cond = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item) -> bool:
+        """Add an item, returning False if an older item had to be dropped"""
+        with self._cond:
+            dropped = len(self._items) >= self.maxsize
+            if dropped:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append((time.perf_counter(), item))
+            self._cond.notify()
+            return not dropped
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Tuple[float, Any]]:
+        """Get (enqueue time, item), or None on timeout or once closed and empty"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._items or self.closed, timeout)
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def close(self):
+        """Wake every waiting consumer so it can exit"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class StageStats:
+    """Running latency and throughput statistics for one stage"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.errors = 0
+        self.latency = 0.0  # Exponential moving average of service time (s)
+        self.wait = 0.0  # Exponential moving average of time spent queued (s)
+        self.max_latency = 0.0
+
+    def record(self, latency: float, wait: float):
+        with self._lock:
+            self.processed += 1
+            alpha = 0.1 if self.processed > 1 else 1.0
+            self.latency += alpha * (latency - self.latency)
+            self.wait += alpha * (wait - self.wait)
+            self.max_latency = max(self.max_latency, latency)
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+
+class Stage:
+    """A pool of worker threads applying one function to queued items
+
+    Returning None from the function consumes the item; anything else is
+    passed to the next stage.
+    """
+
+    def __init__(self, name: str, func: Callable, workers: int = 1, queue_size: int = 2):
+        self.name = name
+        self.func = func
+        self.workers = max(workers, 1)
+        self.queue = DropOldestQueue(queue_size)
+        self.next: Optional["Stage"] = None
+        self.stats = StageStats()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        self._threads = [
+            threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        self.queue.close()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _work(self):
+        while True:
+            entry = self.queue.get(timeout=0.5)
+            if entry is None:
+                if self.queue.closed:
+                    return
+                continue
+
+            enqueued_at, item = entry
+            start = time.perf_counter()
+            try:
+                result = self.func(item)
+            except Exception as e:
+                self.stats.record_error()
+                print(f"❌ {self.name} stage error: {e}")
+                continue
+            self.stats.record(time.perf_counter() - start, start - enqueued_at)
+
+            if result is not None and self.next is not None:
+                self.next.queue.put(result)
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "workers": self.workers,
+            "queue_depth": len(self.queue),
+            "dropped": self.queue.dropped,
+            "processed": self.stats.processed,
+            "errors": self.stats.errors,
+            "latency_ms": round(self.stats.latency * 1000, 2),
+            "wait_ms": round(self.stats.wait * 1000, 2),
+            "max_latency_ms": round(self.stats.max_latency * 1000, 2),
+        }
+
+
+class RecognitionPipeline:
+    """Chain of stages ending in a single-threaded sink
+
+    Items must carry `seq` and `timestamp` attributes. The sink runs on one
+    thread and skips items older than the last one it handled, since
+    parallel workers can finish frames out of order. Items with a `source`
+    attribute are ordered per source, so several cameras can share a pipeline.
+    """
+
+    def __init__(self, stages: Sequence[Tuple[str, Callable, int]], sink: Callable,
+                 queue_size: int = 2, sink_name: str = "sink"):
+        self.sink = sink
+        self.stages = [Stage(name, func, workers, queue_size) for name, func, workers in stages]
+        self.stages.append(Stage(sink_name, self._run_sink, 1, queue_size))
+        for stage, next_stage in zip(self.stages, self.stages[1:]):
+            stage.next = next_stage
+
+        self._last_seq: Dict[Any, int] = {}  # Source -> last handled seq
+        self.out_of_order = 0
+        self.end_to_end_latency = 0.0
+        self.completed = 0
+        self.started_at = None
+
+    def start(self):
+        self.started_at = time.time()
+        for stage in self.stages:
+            stage.start()
+
+    def stop(self):
+        for stage in self.stages:
+            stage.stop()
+
+    def submit(self, item) -> bool:
+        """Feed an item into the first stage (drops the oldest queued item when full)"""
+        return self.stages[0].queue.put(item)
+
+    def _run_sink(self, item):
+        source = getattr(item, "source", None)
+        if item.seq <= self._last_seq.get(source, 0):
+            self.out_of_order += 1
+            return None
+        self._last_seq[source] = item.seq
+        self.sink(item)
+
+        self.completed += 1
+        latency = time.time() - item.timestamp
+        alpha = 0.1 if self.completed > 1 else 1.0
+        self.end_to_end_latency += alpha * (latency - self.end_to_end_latency)
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-stage queue depth and latency plus end-to-end figures"""
+        elapsed = time.time() - self.started_at if self.started_at else 0.0
+        return {
+            "stages": {stage.name: stage.get_stats() for stage in self.stages},
+            "completed": self.completed,
+            "out_of_order": self.out_of_order,
+            "fps": round(self.completed / elapsed, 1) if elapsed > 0 else 0.0,
+            "end_to_end_latency_ms": round(self.end_to_end_latency * 1000, 2),
+        }
@@ -0,0 +1,70 @@
+"""
+Region-of-Interest Detection
+Searches expanded windows around known faces instead of the whole frame
+"""
+
+from typing import Callable, List, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .models import Box
+from .tracker import box_iou
+
+
+def expand_box(box: Box, factor: float, frame_shape: Tuple[int, ...]) -> Box:
+    """Grow a box by `factor` of its size on every side, clipped to the frame"""
+    top, right, bottom, left = box
+    height, width = frame_shape[:2]
+    pad_y = int((bottom - top) * factor)
+    pad_x = int((right - left) * factor)
+    return (max(top - pad_y, 0), min(right + pad_x, width), min(bottom + pad_y, height), max(left - pad_x, 0))
+
+
+def merge_windows(windows: Sequence[Box]) -> List[Box]:
+    """Merge overlapping windows so no region is scanned twice"""
+    merged = [list(window) for window in windows]
+    changed = True
+    while changed and len(merged) > 1:
+        changed = False
+        for i in range(len(merged)):
+            for j in range(i + 1, len(merged)):
+                a, b = merged[i], merged[j]
+                if a[0] < b[2] and b[0] < a[2] and a[3] < b[1] and b[3] < a[1]:
+                    merged[i] = [min(a[0], b[0]), max(a[1], b[1]), max(a[2], b[2]), min(a[3], b[3])]
+                    del merged[j]
+                    changed = True
+                    break
+            if changed:
+                break
+    return [tuple(window) for window in merged]
+
+
+def suppress_duplicates(boxes: Sequence[Box], iou_threshold: float = 0.5) -> List[Box]:
+    """Drop boxes that overlap an earlier, larger box"""
+    boxes = sorted(boxes, key=lambda b: (b[2] - b[0]) * (b[1] - b[3]), reverse=True)
+    kept: List[Box] = []
+    for box in boxes:
+        if not kept or box_iou([box], kept).max() < iou_threshold:
+            kept.append(box)
+    return kept
+
+
+def detect_in_rois(frame: np.ndarray, known_boxes: Sequence[Box], detect_fn: Callable[[np.ndarray], List[Box]],
+                   scale: float = 0.5, expand: float = 0.75) -> List[Box]:
+    """Detect faces only inside expanded windows around known boxes
+
+    `frame` is the full-resolution BGR frame and boxes are in its
+    coordinates. Each window is scanned at `scale`, which can be higher than
+    the global scan scale since the windows are small.
+    """
+    windows = merge_windows([expand_box(box, expand, frame.shape) for box in known_boxes])
+    found: List[Box] = []
+    for top, right, bottom, left in windows:
+        if bottom - top < 8 or right - left < 8:
+            continue
+        crop = cv2.resize(frame[top:bottom, left:right], (0, 0), fx=scale, fy=scale)
+        rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+        for t, r, b, l in detect_fn(rgb):
+            found.append((int(t / scale) + top, int(r / scale) + left, int(b / scale) + top, int(l / scale) + left))
+    return suppress_duplicates(found)
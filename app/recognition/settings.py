@@ -0,0 +1,101 @@
+"""
+Recognition Settings
+Attendance recognition settings shared by the GUI app and the kiosk daemon
+"""
+
+from typing import Dict, Optional
+
+from .adaptive import AdaptiveController
+from .detectors import create_detector
+from .engine import RecognitionEngine
+from .matcher import BatchMatcher, DEFAULT_TOLERANCE
+from .motion_gate import MotionGate
+from .tracker import FaceTracker
+
+
+class RecognitionSettings:
+    """Tuning for live attendance recognition, and builders for its parts
+
+    Both AttendanceApp and KioskDaemon build their matcher, tracker, motion
+    gate, engine and controller from one instance, so tuning a value here
+    changes both modes.
+    """
+
+    def __init__(self, tolerance: float = DEFAULT_TOLERANCE, match_margin: float = 0.05,
+                 scale: float = 0.25, roi_scale: Optional[float] = 0.5, full_sweep_interval: float = 1.0,
+                 detect_interval: int = 10, reverify_interval: Optional[float] = 10.0,
+                 vote_window: int = 5, votes_required: int = 3, motion_sensitivity: float = 0.5,
+                 detector_backend: str = "hog", detector_prefilter: Optional[str] = None,
+                 frame_skip: int = 2, min_skip: int = 1, max_skip: int = 6, latency_budget: float = 0.2,
+                 pipeline_workers: Optional[Dict[str, int]] = None, pipeline_queue_size: int = 2,
+                 detection_cooldown: float = 3.0):
+        # Matching: reject near-ties between the two closest students
+        self.tolerance = tolerance
+        self.match_margin = match_margin
+
+        # Detection: tracked faces are searched in windows at roi_scale, with a
+        # full-frame sweep at `scale` every full_sweep_interval seconds
+        self.scale = scale
+        self.roi_scale = roi_scale
+        self.full_sweep_interval = full_sweep_interval
+        self.detector_backend = detector_backend  # "hog", "cnn", "haar" or "dnn"
+        self.detector_prefilter = detector_prefilter  # None, "haar" or "skin"
+
+        # Tracking: identities are re-encoded every reverify_interval seconds, and
+        # a student is accepted once votes_required of vote_window encodings agree
+        self.detect_interval = detect_interval
+        self.reverify_interval = reverify_interval
+        self.vote_window = vote_window
+        self.votes_required = votes_required
+
+        # Motion gate: 0 (least) to 1 (most sensitive)
+        self.motion_sensitivity = motion_sensitivity
+
+        # Frame skip and the adaptive controller's latency budget (seconds)
+        self.frame_skip = frame_skip
+        self.min_skip = min_skip
+        self.max_skip = max_skip
+        self.latency_budget = latency_budget
+
+        # Staged pipeline: capture → detect → encode → match → attendance
+        self.pipeline_workers = pipeline_workers or {"detect": 2, "encode": 2, "match": 1}
+        self.pipeline_queue_size = pipeline_queue_size
+
+        # Seconds between attendance actions for the same student (or unknown faces)
+        self.detection_cooldown = detection_cooldown
+
+    def build_matcher(self, gallery, index_path=None) -> BatchMatcher:
+        matcher = BatchMatcher(gallery, tolerance=self.tolerance, margin=self.match_margin, index_path=index_path)
+        matcher.prepare()
+        return matcher
+
+    def build_tracker(self) -> FaceTracker:
+        return FaceTracker(detect_interval=self.detect_interval, reverify_interval=self.reverify_interval,
+                           vote_window=self.vote_window, votes_required=self.votes_required)
+
+    def build_motion_gate(self) -> MotionGate:
+        motion_gate = MotionGate()
+        motion_gate.set_sensitivity(self.motion_sensitivity)
+        return motion_gate
+
+    def build_detector(self):
+        return create_detector(self.detector_backend, prefilter=self.detector_prefilter)
+
+    def build_engine(self, matcher: BatchMatcher, tracker: Optional[FaceTracker] = None,
+                     motion_gate: Optional[MotionGate] = None) -> RecognitionEngine:
+        return RecognitionEngine(matcher, scale=self.scale, tracker=tracker, motion_gate=motion_gate,
+                                 roi_scale=self.roi_scale, full_sweep_interval=self.full_sweep_interval,
+                                 detector=self.build_detector())
+
+    def build_controller(self, engine: RecognitionEngine) -> AdaptiveController:
+        return AdaptiveController(latency_budget=self.latency_budget, frame_skip=self.frame_skip,
+                                  min_skip=self.min_skip, max_skip=self.max_skip,
+                                  scale=engine.scale, upsample=engine.upsample)
+
+    def pipeline_stages(self, engine: RecognitionEngine):
+        """Get the (name, function, workers) stages for a RecognitionPipeline"""
+        return [
+            ("detect", engine.detect, self.pipeline_workers.get("detect", 1)),
+            ("encode", engine.encode, self.pipeline_workers.get("encode", 1)),
+            ("match", engine.match, self.pipeline_workers.get("match", 1)),
+        ]
@@ -0,0 +1,262 @@
+"""
+Process Recognition Workers
+Runs face detection and encoding in worker processes fed from a shared-memory frame ring
+"""
+
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .engine import FrameJob
+
+
+class SharedFrameRing:
+    """Fixed number of frame slots backed by one shared memory block
+
+    Frames are copied into a slot once; worker processes read them in place,
+    so only slot indices need to cross process boundaries.
+    """
+
+    def __init__(self, slots: int, shape: Tuple[int, ...], dtype=np.uint8,
+                 name: Optional[str] = None, create: bool = True):
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        size = slots * int(np.prod(self.shape)) * self.dtype.itemsize
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=self.dtype, buffer=self.shm.buf)
+        self._owner = create
+        self._free = deque(range(slots))
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def attach(cls, name: str, slots: int, shape: Tuple[int, ...], dtype=np.uint8) -> "SharedFrameRing":
+        """Open an existing ring from a worker process"""
+        return cls(slots, shape, dtype, name=name, create=False)
+
+    def acquire(self) -> Optional[int]:
+        """Reserve a free slot, or None when every slot is in use"""
+        with self._lock:
+            return self._free.popleft() if self._free else None
+
+    def release(self, slot: int):
+        """Return a slot once its worker is done with it"""
+        with self._lock:
+            self._free.append(slot)
+
+    def write(self, slot: int, frame: np.ndarray):
+        self.frames[slot][...] = frame
+
+    def close(self):
+        """Detach from the shared memory (and free it if this ring created it)"""
+        self.frames = None
+        self.shm.close()
+        if self._owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _worker_main(ring_name: str, slots: int, shape: Tuple[int, ...], tasks, results, detector: str = "hog",
+                 prefilter: Optional[str] = None):
+    """Detect and encode faces for each slot index received on the task queue"""
+    import cv2
+    from .detectors import create_detector
+    from .models import FaceModels
+
+    cv2.setNumThreads(1)
+    ring = SharedFrameRing.attach(ring_name, slots, shape)
+    models = FaceModels.get()
+    face_detector = create_detector(detector, prefilter=prefilter)
+    results.put(("ready", os.getpid()))
+
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+
+            slot, seq, scale, upsample = task
+            start = time.perf_counter()
+            try:
+                small_frame = cv2.resize(ring.frames[slot], (0, 0), fx=scale, fy=scale)
+                rgb_small = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+                locations = face_detector.detect(rgb_small, upsample)
+                encodings = models.face_encodings(rgb_small, locations)
+                payload = np.asarray(encodings, dtype=np.float32).reshape(-1, 128).tobytes()
+                counts = face_detector.get_counts() if hasattr(face_detector, "get_counts") else None
+                results.put((slot, seq, scale, locations, payload, time.perf_counter() - start, None,
+                             (os.getpid(), counts)))
+            except Exception as e:
+                results.put((slot, seq, scale, [], b"", time.perf_counter() - start, str(e), (os.getpid(), None)))
+    finally:
+        ring.close()
+
+
+class ProcessRecognitionPool:
+    """Pool of worker processes doing detection and encoding on shared-memory frames
+
+    The parent keeps the original frames; workers only receive slot indices
+    and send back face boxes and encodings. When every slot is busy the
+    incoming frame is dropped. Workers detect and encode on every frame, so
+    optical flow and identity caching do not apply in this mode; pass the
+    collected jobs through RecognitionEngine.associate() before matching so
+    identities are still voted per track.
+
+    The detector backend and prefilter are built once in each worker, so
+    changing them takes effect the next time the pool is started.
+    """
+
+    def __init__(self, workers: Optional[int] = None, slots: Optional[int] = None,
+                 scale: float = 0.25, upsample: int = 1, detector: str = "hog",
+                 prefilter: Optional[str] = None):
+        self.workers = workers or max((os.cpu_count() or 2) - 1, 1)
+        self.detector = detector  # Detector backend name, loaded in each worker
+        self.prefilter = prefilter  # Optional cascade prefilter name
+        self.slots = slots or self.workers * 2
+        self.scale = scale
+        self.upsample = upsample
+        self.ring: Optional[SharedFrameRing] = None
+        self._ctx = mp.get_context("spawn")
+        self._tasks = None
+        self._results = None
+        self._processes = []
+        self._pending: Dict[int, Tuple[int, float, np.ndarray]] = {}  # seq -> (slot, timestamp, frame)
+        self._detector_counts: Dict[int, Dict[str, int]] = {}  # Worker pid -> latest cascade counters
+
+        # Stats
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self.errors = 0
+
+    @property
+    def started(self) -> bool:
+        return self.ring is not None
+
+    def start(self, frame_shape: Tuple[int, ...], timeout: float = 30.0):
+        """Create the frame ring and spawn the workers"""
+        self.ring = SharedFrameRing(self.slots, frame_shape)
+        self._tasks = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        for _ in range(self.workers):
+            process = self._ctx.Process(
+                target=_worker_main,
+                args=(self.ring.name, self.slots, self.ring.shape, self._tasks, self._results, self.detector,
+                      self.prefilter),
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+        # Wait for the workers to load their models
+        ready = 0
+        deadline = time.time() + timeout
+        while ready < self.workers and time.time() < deadline:
+            try:
+                message = self._results.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if message[0] == "ready":
+                ready += 1
+        print(f"✅ {ready}/{self.workers} recognition worker processes ready ({self.slots} frame slots)")
+
+    def submit(self, seq: int, timestamp: float, frame: np.ndarray) -> bool:
+        """Copy a frame into a free slot and queue it, returning False if it was dropped"""
+        if frame.shape != self.ring.shape:
+            self.dropped += 1
+            return False
+
+        slot = self.ring.acquire()
+        if slot is None:
+            self.dropped += 1
+            return False
+
+        self.ring.write(slot, frame)
+        self._pending[seq] = (slot, timestamp, frame)
+        self._tasks.put((slot, seq, self.scale, self.upsample))
+        self.submitted += 1
+        return True
+
+    def collect(self, timeout: float = 0.1) -> Optional[FrameJob]:
+        """Get the next finished frame as a FrameJob with boxes and encodings (None once stopped)"""
+        if self.ring is None:
+            return None
+        try:
+            message = self._results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if message[0] == "ready":
+            return None
+
+        slot, seq, scale, locations, payload, elapsed, error, (pid, counts) = message
+        if counts is not None:
+            self._detector_counts[pid] = counts
+        ring, pending = self.ring, self._pending.pop(seq, None)
+        if ring is None or pending is None:
+            return None  # Stopped while this frame was in flight
+        ring.release(slot)
+        _, timestamp, frame = pending
+        if error:
+            self.errors += 1
+            print(f"❌ Recognition worker error: {error}")
+            return None
+
+        self.completed += 1
+        job = FrameJob(seq, timestamp, frame)
+        job.scale = scale
+        job.locations = [tuple(location) for location in locations]
+        job.boxes = [
+            (int(top / scale), int(right / scale), int(bottom / scale), int(left / scale))
+            for top, right, bottom, left in job.locations
+        ]
+        job.encodings = list(np.frombuffer(payload, dtype=np.float32).reshape(-1, 128))
+        job.timings["detect+encode"] = elapsed
+        return job
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the workers and free the shared memory"""
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._pending.clear()
+        if self.ring:
+            self.ring.close()
+            self.ring = None
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "workers": self.workers,
+            "slots": self.slots,
+            "in_flight": len(self._pending),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            **({"detector": self.get_detector_stats()} if self._detector_counts else {}),
+        }
+
+    def get_detector_stats(self) -> Dict[str, float]:
+        """Get the prefilter cascade's rates summed over every worker"""
+        from .cascade import cascade_rates
+        totals = {}
+        for counts in list(self._detector_counts.values()):
+            for key, value in counts.items():
+                totals[key] = totals.get(key, 0) + value
+        return cascade_rates(totals)
@@ -0,0 +1,301 @@
+"""
+Face Tracker
+Carries face boxes and identities across frames so detection can run only every N frames
+"""
+
+import time
+from collections import Counter, deque
+from typing import List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from .models import Box
+
+PENDING_TIMEOUT = 1.0  # Seconds before an encoding request is assumed dropped
+
+
+def box_iou(boxes_a: Sequence[Box], boxes_b: Sequence[Box]) -> np.ndarray:
+    """Get the IoU matrix between two sets of (top, right, bottom, left) boxes"""
+    a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+    top = np.maximum(a[:, None, 0], b[None, :, 0])
+    right = np.minimum(a[:, None, 1], b[None, :, 1])
+    bottom = np.minimum(a[:, None, 2], b[None, :, 2])
+    left = np.maximum(a[:, None, 3], b[None, :, 3])
+    intersection = np.clip(bottom - top, 0, None) * np.clip(right - left, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 1] - a[:, 3])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 1] - b[:, 3])
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return np.where(union > 0, intersection / np.maximum(union, 1e-6), 0.0)
+
+
+class Track:
+    """A face followed across frames, with the identity voted for it
+
+    Each encoding of the face casts a vote. The track is accepted as a
+    student once `votes_required` of the last `vote_window` votes name that
+    student within tolerance, and rejected as unknown once the window is
+    full without such a majority.
+
+    Times are in seconds on whatever clock the caller passes as `now`: wall
+    time for a live camera, the video position for a recording. Without
+    one, time.time() is used.
+    """
+
+    __slots__ = ("id", "box", "name", "distance", "confidence", "accepted", "identified", "votes",
+                 "votes_required", "verified_at", "pending_since", "misses", "lost", "created_at",
+                 "last_detected")
+
+    def __init__(self, track_id: int, box: Box, vote_window: int = 1, votes_required: int = 1,
+                 now: Optional[float] = None):
+        self.id = track_id
+        self.box = box  # (top, right, bottom, left) in full-resolution pixels
+        self.name: Optional[str] = None
+        self.distance = float("inf")  # Mean distance of the agreeing votes
+        self.confidence = 0.0  # 0-1, from the agreeing share of votes and their distance
+        self.accepted = False
+        self.identified = False  # The vote reached a decision (accepted or unknown)
+        self.votes = deque(maxlen=max(vote_window, 1))  # (name or None, distance) per encoding
+        self.votes_required = min(max(votes_required, 1), self.votes.maxlen)
+        self.verified_at = 0.0  # When the identity was last confirmed by an encoding
+        self.pending_since: Optional[float] = None  # When an in-flight encoding was requested
+        self.misses = 0  # Consecutive detections that did not find this track
+        self.lost = False  # Optical flow could not follow the face
+        self.created_at = time.time() if now is None else now
+        self.last_detected = self.created_at
+
+    def needs_encoding(self, reverify_interval: Optional[float] = None, retry_interval: float = 0.0,
+                       now: Optional[float] = None) -> bool:
+        """Whether this track should be encoded, given no live encoding request
+
+        Tracks without an identity always need one. Accepted identities are
+        cached and re-verified every `reverify_interval` seconds (never when
+        None); rejected ones are retried every `retry_interval` seconds.
+        Requests can be dropped by a full pipeline queue, so old ones expire.
+        """
+        now = time.time() if now is None else now
+        if self.pending_since is not None and now - self.pending_since <= PENDING_TIMEOUT:
+            return False
+        if not self.identified:
+            return True
+        interval = reverify_interval if self.accepted else retry_interval
+        return interval is not None and now - self.verified_at >= interval
+
+    def invalidate(self):
+        """Forget the identity and its votes; the face may belong to someone else now"""
+        self.votes.clear()
+        self.name = None
+        self.distance = float("inf")
+        self.confidence = 0.0
+        self.accepted = False
+        self.identified = False
+        self.verified_at = 0.0
+
+    def mark_pending(self, now: Optional[float] = None):
+        self.pending_since = time.time() if now is None else now
+
+    def record_vote(self, name: Optional[str], distance: float, accepted: bool, tolerance: float,
+                    now: Optional[float] = None):
+        """Add one frame's match and re-run the vote over the window
+
+        A single rejected or disagreeing re-verification does not drop an
+        accepted identity; it only loses it when it falls below
+        `votes_required` of the window, or another student reaches it. Until
+        a vote agrees again the identity is left due for verification, so
+        the face keeps being encoded. Track breaks go through invalidate().
+        """
+        now = time.time() if now is None else now
+        vote = name if accepted else None
+        self.votes.append((vote, float(distance)))
+        self.pending_since = None
+
+        counts = Counter(vote for vote, _ in self.votes if vote is not None)
+        winner, count = counts.most_common(1)[0] if counts else (None, 0)
+        if count >= self.votes_required:
+            mean = float(np.mean([d for vote, d in self.votes if vote == winner]))
+            self.name = winner
+            self.distance = mean
+            self.confidence = count / len(self.votes) * max(1.0 - mean / tolerance, 0.0) if tolerance > 0 else 0.0
+            self.accepted = True
+            self.identified = True
+            if vote == winner:
+                self.verified_at = now
+        elif len(self.votes) == self.votes.maxlen:
+            self.name = None
+            self.distance = min(d for _, d in self.votes)
+            self.confidence = 0.0
+            self.accepted = False
+            self.identified = True
+            self.verified_at = now
+        else:
+            self.name = None
+            self.confidence = 0.0
+            self.accepted = False
+            self.identified = False
+
+
+class FaceTracker:
+    """Multi-face tracker using optical flow between detections and IoU association
+
+    Boxes are moved by the median Lucas-Kanade flow of corner points inside
+    them. Full detection is requested every `detect_interval` frames, when
+    there are no tracks, or as soon as a track is lost.
+
+    Identities are cached per track: a recognized face is only re-encoded
+    every `reverify_interval` seconds, or after optical flow lost it. Faces
+    that were not recognized are retried every `retry_interval` seconds.
+
+    A track is only accepted once `votes_required` of its last `vote_window`
+    encodings agree (see Track). Intervals are measured on the clock of the
+    `now` passed to update() and tracks_to_encode(), so a recording can be
+    tracked on its own timeline.
+    """
+
+    def __init__(self, detect_interval: int = 10, iou_threshold: float = 0.3,
+                 max_misses: int = 1, min_flow_points: int = 4,
+                 reverify_interval: Optional[float] = 10.0, retry_interval: float = 1.0,
+                 vote_window: int = 5, votes_required: int = 3):
+        self.detect_interval = detect_interval
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.min_flow_points = min_flow_points
+        self.reverify_interval = reverify_interval
+        self.retry_interval = retry_interval
+        self.vote_window = vote_window
+        self.votes_required = votes_required
+        self.tracks: List[Track] = []
+        self.last_seq = 0
+        self._next_id = 1
+        self._prev_gray: Optional[np.ndarray] = None
+        self._frames_since_detection = detect_interval
+
+        # Stats
+        self.frames = 0
+        self.detections = 0
+        self.tracks_created = 0
+        self.encode_requests = 0
+
+    def clone(self) -> "FaceTracker":
+        """Create an empty tracker with the same settings (e.g. for another camera)"""
+        return FaceTracker(self.detect_interval, self.iou_threshold, self.max_misses, self.min_flow_points,
+                           self.reverify_interval, self.retry_interval, self.vote_window, self.votes_required)
+
+    def reset(self):
+        self.tracks = []
+        self.last_seq = 0
+        self._prev_gray = None
+        self._frames_since_detection = self.detect_interval
+
+    def needs_detection(self) -> bool:
+        """Whether this frame should run full detection"""
+        return (not self.tracks
+                or self._frames_since_detection >= self.detect_interval
+                or any(track.lost for track in self.tracks))
+
+    def tracks_to_encode(self, now: Optional[float] = None) -> List[Track]:
+        """Get the tracks whose faces should be encoded in this frame"""
+        tracks = [track for track in self.tracks
+                  if track.needs_encoding(self.reverify_interval, self.retry_interval, now)]
+        self.encode_requests += len(tracks)
+        return tracks
+
+    def propagate(self, gray: np.ndarray, scale: float):
+        """Move every track by the optical flow from the previous frame
+
+        `gray` is the downscaled grayscale frame; `scale` maps full-resolution
+        boxes onto it.
+        """
+        self.frames += 1
+        self._frames_since_detection += 1
+        prev_gray, self._prev_gray = self._prev_gray, gray
+        if prev_gray is None or prev_gray.shape != gray.shape or not self.tracks:
+            return
+
+        height, width = gray.shape[:2]
+        points, owners = [], []
+        for i, track in enumerate(self.tracks):
+            top, right, bottom, left = (int(v * scale) for v in track.box)
+            top, left = max(top, 0), max(left, 0)
+            bottom, right = min(bottom, height), min(right, width)
+            if bottom - top < 4 or right - left < 4:
+                track.lost = True
+                continue
+            corners = cv2.goodFeaturesToTrack(prev_gray[top:bottom, left:right], maxCorners=20,
+                                              qualityLevel=0.01, minDistance=3)
+            if corners is None or len(corners) < self.min_flow_points:
+                track.lost = True
+                continue
+            corners = corners.reshape(-1, 2) + (left, top)
+            points.append(corners)
+            owners.extend([i] * len(corners))
+
+        if not points:
+            return
+
+        points = np.concatenate(points).astype(np.float32).reshape(-1, 1, 2)
+        owners = np.asarray(owners)
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray, points, None,
+                                                    winSize=(15, 15), maxLevel=2)
+        ok = status.reshape(-1) == 1
+        shifts = (moved - points).reshape(-1, 2)
+
+        for i in np.unique(owners):
+            track = self.tracks[i]
+            good = (owners == i) & ok
+            if good.sum() < self.min_flow_points:
+                track.lost = True
+                continue
+            dx, dy = np.median(shifts[good], axis=0) / scale
+            top, right, bottom, left = track.box
+            track.box = (int(top + dy), int(right + dx), int(bottom + dy), int(left + dx))
+
+    def update(self, boxes: Sequence[Box], now: Optional[float] = None) -> List[Track]:
+        """Associate detected boxes with tracks, returning the newly created tracks"""
+        self.detections += 1
+        self._frames_since_detection = 0
+        now = time.time() if now is None else now
+
+        unmatched_tracks = set(range(len(self.tracks)))
+        unmatched_boxes = set(range(len(boxes)))
+        if self.tracks and len(boxes):
+            iou = box_iou([track.box for track in self.tracks], boxes)
+            # Greedy assignment from the highest overlap down
+            for flat in np.argsort(-iou, axis=None):
+                t, b = np.unravel_index(flat, iou.shape)
+                if iou[t, b] < self.iou_threshold:
+                    break
+                if t in unmatched_tracks and b in unmatched_boxes:
+                    track = self.tracks[t]
+                    if track.lost:
+                        # Flow broke, so the face may belong to someone else now
+                        track.invalidate()
+                    track.box = tuple(boxes[b])
+                    track.misses = 0
+                    track.lost = False
+                    track.last_detected = now
+                    unmatched_tracks.discard(t)
+                    unmatched_boxes.discard(b)
+
+        for t in unmatched_tracks:
+            self.tracks[t].misses += 1
+        self.tracks = [track for track in self.tracks if track.misses <= self.max_misses]
+
+        new_tracks = []
+        for b in sorted(unmatched_boxes):
+            track = Track(self._next_id, tuple(boxes[b]), self.vote_window, self.votes_required, now)
+            self._next_id += 1
+            new_tracks.append(track)
+        self.tracks.extend(new_tracks)
+        self.tracks_created += len(new_tracks)
+        return new_tracks
+
+    def get_stats(self):
+        return {
+            "tracks": len(self.tracks),
+            "frames": self.frames,
+            "detections": self.detections,
+            "detection_ratio": self.detections / self.frames if self.frames else 0.0,
+            "tracks_created": self.tracks_created,
+            "encode_requests": self.encode_requests,
+        }
@@ -0,0 +1,39 @@
+"""
+Attendance Log
+Appends attendance records to the CSV file shared by the GUI and the kiosk daemon
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+
+class AttendanceLog:
+    """CSV attendance log with one `Name,Timestamp` row per student"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def prepare(self):
+        """Create the file with its header if it does not exist"""
+        if not self.path.exists():
+            with open(self.path, "w") as f:
+                f.write("Name,Timestamp\n")
+            print(f"✅ Created attendance file: {self.path}")
+
+    def mark(self, name: str) -> bool:
+        """Append a record for a student, returning False if already marked"""
+        try:
+            with open(self.path, "r+", newline="") as f:
+                entries = f.readlines()
+                names = [e.split(',')[0] for e in entries]
+                if name not in names:
+                    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    f.write(f"{name},{now}\n")
+                    print(f"✅ Marked {name} at {now}")
+                    return True
+                else:
+                    print(f"⚠️  {name} already marked today")
+                    return False
+        except Exception as e:
+            print(f"❌ Error marking attendance: {e}")
+            return False
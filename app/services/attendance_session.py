@@ -0,0 +1,70 @@
+"""
+Attendance Session
+Cooldown, marking and counts for recognized faces, shared by the GUI app and the kiosk daemon
+"""
+
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+UNKNOWN = "UNKNOWN"
+
+
+class AttendanceSession:
+    """Turns recognized faces into attendance marks for one camera session
+
+    Each student (and unknown faces as a group) is acted on at most once
+    per `cooldown` seconds. Students are marked in the attendance log the
+    first time they are seen; every mark and unknown face is recorded as
+    an event with the camera that saw it.
+    """
+
+    def __init__(self, log, cooldown: float = 3.0, max_events: Optional[int] = None):
+        self.log = log  # AttendanceLog
+        self.cooldown = cooldown
+        self.present_students = set()
+        self.unknown_count = 0
+        self.last_detection_time = {}
+        self.events = deque(maxlen=max_events)
+
+    def observe(self, name: Optional[str], accepted: bool, source=None, confidence: float = 0.0) -> Optional[str]:
+        """Handle one recognized face
+
+        Returns "present" when a student was newly marked, "unknown" when an
+        unknown face was counted, and None when nothing changed.
+        """
+        key = name if accepted else 'unknown'
+        now = time.time()
+        if now - self.last_detection_time.get(key, 0) < self.cooldown:
+            return None
+        self.last_detection_time[key] = now
+
+        if not accepted:
+            self.unknown_count += 1
+            self.record_event(UNKNOWN, source)
+            print(f"❓ Unknown face detected on {source} (total: {self.unknown_count})")
+            return "unknown"
+
+        if not self.log.mark(name):
+            return None
+        self.present_students.add(name)
+        self.record_event(name, source, confidence)
+        print(f"✅ Student detected: {name} ({source}, confidence {confidence:.2f})")
+        return "present"
+
+    def record_event(self, name, source, confidence=0.0):
+        """Record a detection with the camera that made it and its vote confidence"""
+        self.events.append({
+            'name': name,
+            'source': source,
+            'confidence': round(confidence, 3),
+            'time': datetime.now().strftime("%H:%M:%S"),
+        })
+
+    def reset(self):
+        """Forget marks, counts and events (e.g. when the camera stops)"""
+        self.present_students.clear()
+        self.unknown_count = 0
+        self.last_detection_time.clear()
+        self.events.clear()
@@ -0,0 +1,104 @@
+"""
+UI Bridge
+Hands frames and UI updates from worker threads to the Tk main loop
+"""
+
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class UIBridge:
+    """Thread-safe hand-off from recognition workers to Tk
+
+    Tk may only be touched from its own thread. Workers publish the latest
+    annotated frame into a single slot and post UI callbacks to a queue;
+    neither takes a lock (reference assignment and deque append/popleft are
+    atomic). The Tk loop pulls both at a fixed rate with `after()`, so a
+    frame replaced before it was shown is simply dropped.
+    """
+
+    def __init__(self, root, present: Callable[[np.ndarray, Sequence], None], fps: float = 30.0):
+        self.root = root
+        self.present = present  # Called on the Tk thread with the latest frame and its annotations
+        self.interval_ms = max(int(1000 / fps), 1)
+        self._frame: Optional[Tuple[np.ndarray, Sequence]] = None
+        self._events = deque()
+        self._after_id = None
+        self.running = False
+
+        # Stats
+        self.published = 0
+        self.presented = 0
+        self.present_time = 0.0  # EMA of seconds spent presenting a frame
+
+    def publish_frame(self, frame: np.ndarray, annotations: Sequence = ()):
+        """Offer a frame and its overlays for display (any thread); replaces one not yet shown"""
+        self._frame = (frame, annotations)
+        self.published += 1
+
+    def post(self, callback: Callable, *args, **kwargs):
+        """Run a callback on the Tk thread at the next tick (any thread)"""
+        self._events.append((callback, args, kwargs))
+
+    def discard_frame(self):
+        """Drop the pending frame, keeping queued callbacks"""
+        self._frame = None
+
+    def clear(self):
+        """Drop the pending frame and queued callbacks"""
+        self._frame = None
+        self._events.clear()
+
+    def start(self):
+        """Start pulling on the Tk thread"""
+        if self.running:
+            return
+        self.running = True
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        """Stop pulling and forget the pending frame"""
+        self.running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        self._frame = None
+
+    def _tick(self):
+        """Run queued callbacks, then show the newest frame"""
+        events = self._events
+        while events:
+            callback, args, kwargs = events.popleft()
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                print(f"❌ UI update error: {e}")
+
+        pending, self._frame = self._frame, None
+        if pending is not None:
+            start = time.perf_counter()
+            try:
+                self.present(*pending)
+            except Exception as e:
+                print(f"❌ Camera display update error: {e}")
+            elapsed = time.perf_counter() - start
+            self.present_time += (0.1 if self.presented else 1.0) * (elapsed - self.present_time)
+            self.presented += 1
+
+        if self.running:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get published, presented and dropped frame counts"""
+        return {
+            "published": self.published,
+            "presented": self.presented,
+            "dropped": max(self.published - self.presented, 0),
+            "present_ms": round(self.present_time * 1000, 2),
+        }
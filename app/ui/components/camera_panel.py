@@ -1,12 +1,11 @@
 import customtkinter as ctk
-from PIL import Image, ImageTk
-import cv2
-import numpy as np
+from ..renderer import DisplayRenderer
 
 class CameraPanel:
     def __init__(self, parent):
         self.parent = parent
         self.camera_visible = False
+        self.renderer = DisplayRenderer(padding=30)
         
         # Camera Panel Container
         self.container = ctk.CTkFrame(parent.main_content, corner_radius=15, fg_color=("gray92", "gray12"))
@@ -23,6 +22,7 @@ class CameraPanel:
         # Camera Content Frame
         self.content_frame = ctk.CTkFrame(self.camera_frame, corner_radius=10)
         self.content_frame.pack(expand=True, fill="both", padx=5, pady=5)
+        self.content_frame.bind("<Configure>", self.renderer.on_configure)  # Track size, never poll it
         
         # Create placeholder frame for camera emoji
         self.placeholder_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
@@ -56,40 +56,25 @@ class CameraPanel:
         self.show_loading(False)  # Hide loading message
         self.camera_visible = True
 
-    def update_frame(self, frame):
+    def update_frame(self, frame, annotations=()):
+        """Show a BGR frame with its annotations (Tk thread only)"""
+        if not self.camera_visible:
+            return  # Preview hidden; nothing to render
         if frame is not None:
             # Show camera label and hide placeholder
             if not self.camera_label.winfo_ismapped():
                 self.placeholder_frame.pack_forget()
                 self.camera_label.pack(expand=True, fill="both", padx=15, pady=15)
             
-            # Convert frame to PhotoImage
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame = Image.fromarray(frame)
+            # Size is known from <Configure> after the first layout
+            if self.renderer.display_size is None:
+                self.renderer.set_display_size(self.content_frame.winfo_width(),
+                                               self.content_frame.winfo_height())
             
-            # Calculate new size maintaining aspect ratio
-            display_width = self.content_frame.winfo_width() - 30  # Account for padding
-            display_height = self.content_frame.winfo_height() - 30
-            
-            if display_width > 0 and display_height > 0:
-                # Calculate scaling factor
-                frame_ratio = frame.width / frame.height
-                display_ratio = display_width / display_height
-                
-                if frame_ratio > display_ratio:
-                    # Width limited
-                    new_width = display_width
-                    new_height = int(display_width / frame_ratio)
-                else:
-                    # Height limited
-                    new_height = display_height
-                    new_width = int(display_height * frame_ratio)
-                
-                frame = frame.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            photo = ImageTk.PhotoImage(frame)
-            self.camera_label.configure(image=photo)
-            self.camera_label.image = photo  # Keep a reference
+            # Only a resized frame needs a new PhotoImage; otherwise it is updated in place
+            if self.renderer.render(frame, annotations):
+                self.camera_label.configure(image=self.renderer.photo)
+                self.camera_label.image = self.renderer.photo  # Keep a reference
             
             # Hide loading label when frame is shown
             self.loading_label.lower()
@@ -1,116 +1,233 @@
 import customtkinter as ctk
-from PIL import Image, ImageTk
 import os
+from ..thumbnails import ThumbnailCache
+
+ROW_HEIGHT = 100  # Pixels per student card, including padding
+PRESENT_COLOR = ("lightgreen", "darkgreen")
+ABSENT_COLOR = ("gray92", "gray12")
+
+class StudentRow:
+    """One reusable card widget, bound to whichever student is scrolled into its slot"""
+    def __init__(self, master):
+        self.card = ctk.CTkFrame(master, corner_radius=10, height=ROW_HEIGHT - 10, fg_color=ABSENT_COLOR)
+        self.card.pack_propagate(False)
+        self.student = None
+        self.shown = False
+
+        # Color indicator
+        self.color_frame = ctk.CTkFrame(self.card, width=10, height=80, corner_radius=5)
+        self.color_frame.pack(side="left", padx=10, pady=5)
+
+        # Student image
+        self.img_label = ctk.CTkLabel(self.card, text="No\nImage", width=60, height=60)
+        self.img_label.pack(side="left", padx=(0, 10))
+
+        # Student information
+        text_frame = ctk.CTkFrame(self.card, fg_color="transparent")
+        text_frame.pack(side="left", fill="x", expand=True)
+        self.name_label = ctk.CTkLabel(text_frame, text="", font=("Arial Bold", 14), anchor="w")
+        self.name_label.pack(anchor="w")
+        self.details_label = ctk.CTkLabel(text_frame, text="", font=("Arial", 12), anchor="w", justify="left")
+        self.details_label.pack(anchor="w")
+
+    def bind(self, student, photo):
+        """Show a student's details, presence and thumbnail"""
+        if student is not self.student:
+            self.student = student
+            color = student['color']
+            self.color_frame.configure(fg_color=f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}")
+            self.name_label.configure(text=student['name'].title())
+            self.details_label.configure(text=student['details'])
+        self.card.configure(fg_color=PRESENT_COLOR if student['present'] else ABSENT_COLOR)
+        if photo is not None:
+            self.img_label.configure(image=photo, text="")
+        else:
+            self.img_label.configure(image=None, text="No\nImage")
+        self.img_label.image = photo  # Keep a reference
 
 class StudentsPanel:
+    """Student list that only builds widgets for the rows on screen
+
+    Students are plain records kept in display order with O(1) lookup by
+    name and ID. A small pool of StudentRow widgets, just enough to fill
+    the visible area, is rebound to whichever students are scrolled into
+    view; thumbnails are decoded off the Tk thread and kept in an LRU cache.
+    """
     def __init__(self, parent):
         self.parent = parent
-        self.student_cards = {}  # Dictionary to store student cards by ID
-        
+        self.students = []  # Student records in display order
+        self.student_cards = {}  # Student records by ID
+        self.cards_by_name = {}  # Student records by name
+        self.top = 0  # Index of the first visible student
+        self.visible_rows = 0
+        self.rows = []  # Reusable row widgets
+        self.refresh_pending = False
+        self.polling = False
+        self.thumbnails = ThumbnailCache(size=(60, 60), capacity=128)
+        self.images_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                       "Images", "Students")
+
         # Students Panel Container
         self.container = ctk.CTkFrame(parent.main_content, corner_radius=15, fg_color=("gray92", "gray12"))
         self.container.grid(row=0, column=2, sticky="nsew", padx=5, pady=0)
-        
+
         # Students Panel Label
         ctk.CTkLabel(self.container, text="Students Panel", font=("Arial Bold", 20)).pack(pady=(15, 20))
 
-        # Create scrollable frame for student cards
-        self.scrollable_frame = ctk.CTkScrollableFrame(self.container, corner_radius=10)
-        self.scrollable_frame.pack(expand=True, fill="both", padx=10, pady=(0, 15))
+        # Virtualized list: a fixed pool of rows and a scrollbar over the records
+        self.list_container = ctk.CTkFrame(self.container, corner_radius=10)
+        self.list_container.pack(expand=True, fill="both", padx=10, pady=(0, 15))
+        self.scrollbar = ctk.CTkScrollbar(self.list_container, command=self.on_scroll)
+        self.scrollbar.pack(side="right", fill="y", padx=(0, 5), pady=5)
+        self.list_frame = ctk.CTkFrame(self.list_container, fg_color="transparent")
+        self.list_frame.pack(side="left", expand=True, fill="both", padx=5, pady=5)
+        self.list_frame.bind("<Configure>", self.on_resize)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.list_container.bind_all(sequence, self.on_mousewheel, add="+")
 
     def create_student_card(self, student_id, name, color, student_info, image_path=None):
         # Check if card already exists
         if student_id in self.student_cards:
             return
-            
-        # Create card frame
-        card = ctk.CTkFrame(self.scrollable_frame, corner_radius=10)
-        card.pack(fill="x", padx=5, pady=5)
-        
-        # Color indicator
-        color_frame = ctk.CTkFrame(card, width=10, height=80, corner_radius=5)
-        color_frame.pack(side="left", padx=10, pady=10)
-        color_frame.configure(fg_color=f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}")
-        
-        # Information frame
-        info_frame = ctk.CTkFrame(card, fg_color="transparent")
-        info_frame.pack(side="left", fill="x", expand=True, padx=10, pady=10)
-        
-        # Try to find a student image
-        image_found = False
-        if image_path is None:
-            student_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                                        "Images", "Students", name)
-            if os.path.exists(student_folder):
-                for file in os.listdir(student_folder):
-                    if file.lower().endswith(('.png', '.jpg', '.jpeg')):
-                        image_path = os.path.join(student_folder, file)
-                        break
-
-        # Load and display student image
-        if image_path and os.path.exists(image_path):
-            try:
-                img = Image.open(image_path)
-                img = img.resize((60, 60), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
-                
-                img_label = ctk.CTkLabel(info_frame, image=photo, text="")
-                img_label.image = photo  # Keep a reference
-                img_label.pack(side="left", padx=(0, 10))
-                image_found = True
-            except Exception as e:
-                print(f"Error loading image for {name}: {e}")
-
-        if not image_found:
-            img_label = ctk.CTkLabel(info_frame, text="No\nImage", width=60, height=60)
-            img_label.pack(side="left", padx=(0, 10))
 
-        # Student information
-        text_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
-        text_frame.pack(side="left", fill="x", expand=True)
-        
-        # Student name
-        ctk.CTkLabel(text_frame, text=name.title(), 
-                    font=("Arial Bold", 14)).pack(anchor="w", pady=(0, 5))
-        
-        # Student ID
-        ctk.CTkLabel(text_frame, text=f"ID: {student_id}", 
-                    font=("Arial", 12)).pack(anchor="w", pady=2)
-        
         # Course, Year, Section
+        details = [f"ID: {student_id}"]
         if isinstance(student_info, dict):
-            if 'course' in student_info:
-                ctk.CTkLabel(text_frame, text=f"Course: {student_info['course']}", 
-                           font=("Arial", 12)).pack(anchor="w", pady=2)
-            if 'year' in student_info:
-                ctk.CTkLabel(text_frame, text=f"Year: {student_info['year']}", 
-                           font=("Arial", 12)).pack(anchor="w", pady=2)
-            if 'section' in student_info:
-                ctk.CTkLabel(text_frame, text=f"Section: {student_info['section']}", 
-                           font=("Arial", 12)).pack(anchor="w", pady=2)
-        
-        # Store card reference
-        self.student_cards[student_id] = card
+            for key, label in (('course', "Course"), ('year', "Year"), ('section', "Section")):
+                if key in student_info:
+                    details.append(f"{label}: {student_info[key]}")
+
+        student = {
+            'id': student_id,
+            'name': name,
+            'color': color,
+            'details': "\n".join(details),
+            'image_path': image_path,
+            'present': False,
+        }
+        self.students.append(student)
+        self.student_cards[student_id] = student
+        self.cards_by_name[name] = student
+        self.schedule_refresh()
 
     def remove_student_card(self, student_id):
-        if student_id in self.student_cards:
-            self.student_cards[student_id].destroy()
-            del self.student_cards[student_id]
+        student = self.student_cards.pop(student_id, None)
+        if student is None:
+            return
+        self.students.remove(student)
+        if self.cards_by_name.get(student['name']) is student:
+            del self.cards_by_name[student['name']]
+        self.schedule_refresh()
 
     def update_student_card(self, name, is_present):
         """Update student card status"""
-        # Find the student card by name
-        for student_id, card in self.student_cards.items():
-            # Check if this card belongs to the student
-            if hasattr(card, 'student_name') and card.student_name == name:
-                # Update the card appearance based on presence
-                if is_present:
-                    card.configure(fg_color=("lightgreen", "darkgreen"))
-                else:
-                    card.configure(fg_color=("gray92", "gray12"))
-                break
-    
+        student = self.cards_by_name.get(name)
+        if student is None or student['present'] == is_present:
+            return
+        student['present'] = is_present
+
+        # Only a visible student has a widget to update
+        index = self.index_of(student)
+        if index is not None:
+            self.bind_row(index - self.top)
+
     def clear_all_cards(self):
-        for card in self.student_cards.values():
-            card.destroy()
-        self.student_cards.clear() 
\ No newline at end of file
+        self.students.clear()
+        self.student_cards.clear()
+        self.cards_by_name.clear()
+        self.top = 0
+        self.schedule_refresh()
+
+    def index_of(self, student):
+        """Get a student's position if it is on screen"""
+        for index in range(self.top, min(self.top + self.visible_rows, len(self.students))):
+            if self.students[index] is student:
+                return index
+        return None
+
+    def schedule_refresh(self):
+        """Coalesce many record changes into one refresh at the next idle moment"""
+        if not self.refresh_pending:
+            self.refresh_pending = True
+            self.list_frame.after_idle(self.refresh)
+
+    def refresh(self):
+        """Bind the row widgets to the students scrolled into view"""
+        self.refresh_pending = False
+        total = len(self.students)
+        self.top = max(min(self.top, total - self.visible_rows), 0)
+
+        # Grow the widget pool only as far as the visible area needs
+        while len(self.rows) < min(self.visible_rows, total):
+            self.rows.append(StudentRow(self.list_frame))
+        for slot, row in enumerate(self.rows):
+            if self.top + slot < total and slot < self.visible_rows:
+                if not row.shown:
+                    row.card.pack(fill="x", padx=5, pady=5)
+                    row.shown = True
+                self.bind_row(slot)
+            elif row.shown:
+                row.card.pack_forget()
+                row.shown = False
+                row.student = None
+
+        if total:
+            self.scrollbar.set(self.top / total, min((self.top + self.visible_rows) / total, 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def bind_row(self, slot):
+        """Show the student at a visible slot, loading its thumbnail in the background if needed"""
+        student = self.students[self.top + slot]
+        photo = self.thumbnails.get(student['id'])
+        if photo is False:
+            self.thumbnails.request(student['id'], student['image_path'],
+                                    os.path.join(self.images_dir, student['name']))
+            if not self.polling:
+                self.polling = True
+                self.list_frame.after(50, self.poll_thumbnails)
+            photo = None
+        self.rows[slot].bind(student, photo)
+
+    def poll_thumbnails(self):
+        """Show thumbnails decoded by the pool (Tk thread)"""
+        self.thumbnails.drain(self.on_thumbnail)
+        self.polling = self.thumbnails.loading
+        if self.polling:
+            self.list_frame.after(50, self.poll_thumbnails)
+
+    def on_thumbnail(self, student_id):
+        student = self.student_cards.get(student_id)
+        index = self.index_of(student) if student else None
+        if index is not None:
+            self.bind_row(index - self.top)
+
+    def scroll_to(self, top):
+        top = max(min(top, len(self.students) - self.visible_rows), 0)
+        if top != self.top:
+            self.top = top
+            self.refresh()
+
+    def on_scroll(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', count, 'units'/'pages')"""
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.students)))
+        elif args[0] == "scroll":
+            step = self.visible_rows if args[2] == "pages" else 1
+            self.scroll_to(self.top + int(args[1]) * step)
+
+    def on_mousewheel(self, event):
+        # Only scroll when the pointer is over the list
+        widget = self.list_container.winfo_containing(event.x_root, event.y_root)
+        if widget is None or not str(widget).startswith(str(self.list_container)):
+            return
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.top - 1)
+        else:
+            self.scroll_to(self.top + 1)
+
+    def on_resize(self, event):
+        visible_rows = max(event.height // ROW_HEIGHT, 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.schedule_refresh()
@@ -0,0 +1,101 @@
+"""
+Display Renderer
+Scales camera frames to the preview and updates a single persistent PhotoImage
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+
+GREEN = (0, 255, 0)  # BGR
+RED = (0, 0, 255)
+
+
+class Annotation:
+    """Overlay for one face, drawn at display size when the frame is shown"""
+
+    __slots__ = ("box", "label", "color")
+
+    def __init__(self, box: Tuple[int, int, int, int], label: str, color: Tuple[int, int, int]):
+        self.box = box  # (top, right, bottom, left) in capture coordinates
+        self.label = label
+        self.color = color  # BGR
+
+
+class DisplayRenderer:
+    """Fits BGR frames to a display area with as little work per frame as possible
+
+    The display area is only updated from `<Configure>` events, so no window
+    geometry is queried per frame. Frames are shrunk with INTER_AREA into a
+    reused buffer, converted to RGB at display size and pasted into one
+    PhotoImage; a new PhotoImage is only created when the fitted size changes.
+    Annotations are drawn into the display-sized buffer, never the capture.
+    """
+
+    def __init__(self, padding: int = 30):
+        self.padding = padding  # Pixels around the image inside the display area
+        self.display_size: Optional[Tuple[int, int]] = None
+        self.photo: Optional[ImageTk.PhotoImage] = None
+        self._fit_key = None  # Frame and display size the cached fit was computed for
+        self._fit_size = None
+        self._scaled: Optional[np.ndarray] = None
+        self._rgb: Optional[np.ndarray] = None
+
+    def on_configure(self, event):
+        """`<Configure>` handler for the widget the image is shown in"""
+        self.set_display_size(event.width, event.height)
+
+    def set_display_size(self, width: int, height: int):
+        self.display_size = (width - self.padding, height - self.padding)
+
+    def fit_size(self, frame_width: int, frame_height: int) -> Tuple[int, int]:
+        """Get the display size for a frame, keeping its aspect ratio"""
+        key = (frame_width, frame_height, self.display_size)
+        if key == self._fit_key:
+            return self._fit_size
+
+        size = (frame_width, frame_height)
+        if self.display_size and self.display_size[0] > 0 and self.display_size[1] > 0:
+            display_width, display_height = self.display_size
+            frame_ratio = frame_width / frame_height
+            if frame_ratio > display_width / display_height:
+                # Width limited
+                size = (display_width, max(int(display_width / frame_ratio), 1))
+            else:
+                # Height limited
+                size = (max(int(display_height * frame_ratio), 1), display_height)
+
+        self._fit_key, self._fit_size = key, size
+        return size
+
+    def prepare(self, frame: np.ndarray, annotations: Sequence[Annotation] = ()) -> np.ndarray:
+        """Scale a BGR frame to its display size, convert it to RGB and draw annotations, reusing buffers"""
+        width, height = self.fit_size(frame.shape[1], frame.shape[0])
+        if self._rgb is None or self._rgb.shape[:2] != (height, width):
+            self._scaled = np.empty((height, width, 3), dtype=np.uint8)
+            self._rgb = np.empty((height, width, 3), dtype=np.uint8)
+
+        factor = width / frame.shape[1]
+        if (width, height) != (frame.shape[1], frame.shape[0]):
+            cv2.resize(frame, (width, height), dst=self._scaled, interpolation=cv2.INTER_AREA)
+            frame = self._scaled
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)  # The only colour conversion
+
+        for annotation in annotations:
+            top, right, bottom, left = (int(value * factor) for value in annotation.box)
+            color = annotation.color[::-1]  # Drawing on RGB
+            cv2.rectangle(self._rgb, (left, top), (right, bottom), color, 2)
+            cv2.putText(self._rgb, annotation.label, (left, top - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+        return self._rgb
+
+    def render(self, frame: np.ndarray, annotations: Sequence[Annotation] = ()) -> bool:
+        """Draw a BGR frame and its annotations into `photo`; True when a new PhotoImage had to be created"""
+        image = Image.fromarray(self.prepare(frame, annotations))
+        if self.photo is not None and (self.photo.width(), self.photo.height()) == image.size:
+            self.photo.paste(image)
+            return False
+        self.photo = ImageTk.PhotoImage(image)
+        return True
@@ -0,0 +1,95 @@
+"""
+Thumbnail Cache
+Decodes student photos into small thumbnails on a background pool, with an LRU cache
+"""
+
+import os
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from PIL import Image, ImageTk
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+def find_student_image(folder) -> Optional[str]:
+    """Get the first photo in a student's folder, if any"""
+    try:
+        for file in sorted(os.listdir(folder)):
+            if file.lower().endswith(IMAGE_EXTENSIONS):
+                return os.path.join(folder, file)
+    except OSError:
+        pass
+    return None
+
+
+def load_thumbnail(path: str, size: Tuple[int, int]) -> Image.Image:
+    """Decode a photo at reduced size and fit it into `size`"""
+    image = Image.open(path)
+    image.draft("RGB", size)  # JPEG: decode at 1/2, 1/4 or 1/8 scale instead of full size
+    image = image.convert("RGB")
+    image.thumbnail(size, Image.Resampling.BILINEAR)
+    return image
+
+
+class ThumbnailCache:
+    """LRU cache of thumbnail PhotoImages keyed by student
+
+    Finding and decoding photos runs on a small thread pool; the decoded
+    images are only turned into PhotoImages on the Tk thread, by `drain()`,
+    which a widget polls with `after()` while loads are pending.
+    """
+
+    def __init__(self, size: Tuple[int, int] = (60, 60), capacity: int = 128, workers: int = 2):
+        self.size = size
+        self.capacity = capacity
+        self._photos = OrderedDict()  # key -> PhotoImage, or None when there is no photo
+        self._pending = set()
+        self._ready = deque()  # (key, PIL image or None) from the pool
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnail")
+
+    def get(self, key):
+        """Get a cached thumbnail (Tk thread); False when not loaded yet, None when there is no photo"""
+        if key not in self._photos:
+            return False
+        self._photos.move_to_end(key)
+        return self._photos[key]
+
+    def request(self, key, image_path: Optional[str] = None, folder: Optional[str] = None):
+        """Start loading a thumbnail unless it is cached or already loading"""
+        if key in self._photos or key in self._pending:
+            return
+        self._pending.add(key)
+        self._pool.submit(self._load, key, image_path, folder)
+
+    def _load(self, key, image_path, folder):
+        image = None
+        try:
+            path = image_path or (folder and find_student_image(folder))
+            if path and os.path.exists(path):
+                image = load_thumbnail(path, self.size)
+        except Exception as e:
+            print(f"Error loading image for {key}: {e}")
+        self._ready.append((key, image))
+
+    @property
+    def loading(self) -> bool:
+        return bool(self._pending)
+
+    def drain(self, on_loaded: Callable):
+        """Cache finished thumbnails as PhotoImages and call `on_loaded(key)` for each (Tk thread)"""
+        while self._ready:
+            key, image = self._ready.popleft()
+            self._pending.discard(key)
+            self._photos[key] = ImageTk.PhotoImage(image) if image is not None else None
+            self._photos.move_to_end(key)
+            while len(self._photos) > self.capacity:
+                self._photos.popitem(last=False)
+            on_loaded(key)
+
+    def clear(self):
+        self._photos.clear()
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
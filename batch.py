@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Face Recognition Attendance System - Headless batch mode
+Recognizes students in recorded videos and image folders without the GUI.
+
+Usage:
+    python batch.py lecture.mp4 recordings/ --output attendance_batch.csv
+    python batch.py snapshots/ --workers 4 --frame-step 2
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from app.recognition.batch import run_batch
+from app.recognition.encoding_cache import CACHE_FILENAME, EncodingCache
+from app.recognition.enrollment import enroll_gallery
+
+STUDENTS_DIR = Path(__file__).parent.absolute() / "app" / "Images" / "Students"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Recognize students in video files and image folders")
+    parser.add_argument("inputs", nargs="+", help="Video files, image folders or folders of videos")
+    parser.add_argument("--students", default=str(STUDENTS_DIR), help="Student photo gallery folder")
+    parser.add_argument("--output", help="CSV file for attendance records (printed when omitted)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--frame-step", type=int, default=1, help="Process every Nth frame")
+    parser.add_argument("--scale", type=float, default=0.25, help="Detection downscale factor")
+    parser.add_argument("--upsample", type=int, default=1, help="Detector upsampling passes")
+    parser.add_argument("--detector", default="hog", help="Face detector backend: hog, cnn, haar or dnn")
+    parser.add_argument("--prefilter", help="Cheap prefilter run before the detector: haar or skin")
+    parser.add_argument("--tolerance", type=float, default=0.6, help="Maximum match distance")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    students_dir = Path(args.students)
+    if not students_dir.is_dir():
+        print(f"❌ Students folder not found: {students_dir}")
+        return 1
+
+    cache = EncodingCache(students_dir / CACHE_FILENAME, root_dir=students_dir)
+    gallery = enroll_gallery(students_dir, cache=cache, workers=args.workers)
+    print(f"✅ Loaded {len(gallery)} encodings for {gallery.num_students} students")
+
+    report = run_batch(args.inputs, gallery, workers=args.workers, tolerance=args.tolerance,
+                       scale=args.scale, upsample=args.upsample, frame_step=args.frame_step,
+                       detector=args.detector, prefilter=args.prefilter)
+
+    if args.output:
+        report.write_csv(args.output)
+        print(f"✅ Attendance records written to {args.output}")
+    else:
+        for sighting in report.records.values():
+            print(f"{sighting.name},{sighting.source},{sighting.offset:.2f},{sighting.distance:.4f},"
+                  f"{sighting.confidence:.3f}")
+    print(report.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
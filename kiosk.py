@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Face Recognition Attendance System - Headless kiosk daemon
+Runs attendance on units without a display. No GUI libraries are imported.
+
+Usage:
+    python kiosk.py                          # Default camera, status in app/kiosk_status.json
+    python kiosk.py --camera 0 --camera rtsp://door-cam/stream --status /run/kiosk.json
+"""
+
+import argparse
+import signal
+import sys
+
+from app.kiosk import KioskDaemon
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run face recognition attendance without a GUI")
+    parser.add_argument("--camera", action="append", dest="cameras",
+                        help="Device index, video file, image folder or stream URL (repeatable)")
+    parser.add_argument("--status", help="Status JSON file (default: app/kiosk_status.json)")
+    parser.add_argument("--detector", default="hog", help="Face detector backend: hog, cnn, haar or dnn")
+    parser.add_argument("--prefilter", help="Cheap prefilter run before the detector: haar or skin")
+    parser.add_argument("--status-interval", type=float, default=2.0, help="Seconds between status updates")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    daemon = KioskDaemon(camera_sources=args.cameras or [0], status_path=args.status,
+                         status_interval=args.status_interval, detector_backend=args.detector,
+                         detector_prefilter=args.prefilter)
+
+    def handle_signal(signum, frame):
+        print(f"\n🛑 Received signal {signum}")
+        daemon.stop()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+    return 0 if daemon.run() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+from app.recognition.adaptive import AdaptiveController
+
+
+def run(controller, latency, frames):
+    for _ in range(frames):
+        controller.observe({"detect": latency}, latency)
+
+
+def test_degrades_upsample_then_scale_then_frame_skip():
+    controller = AdaptiveController(latency_budget=0.1, frame_skip=1, min_skip=1, max_skip=2,
+                                    scales=(0.25, 0.5), scale=0.5, upsample=1, settle_frames=1)
+    decisions = []
+    for _ in range(4):
+        run(controller, 0.5, 1)
+        decisions.append((controller.upsample, controller.scale, controller.frame_skip))
+
+    assert decisions == [(0, 0.5, 1), (0, 0.25, 1), (0, 0.25, 2), (0, 0.25, 2)]
+
+
+def test_improves_in_reverse_order_within_bounds():
+    controller = AdaptiveController(latency_budget=0.1, frame_skip=2, min_skip=1, max_skip=2,
+                                    scales=(0.25, 0.5), scale=0.25, upsample=0, max_upsample=1,
+                                    settle_frames=1)
+    run(controller, 0.01, 5)
+
+    assert (controller.upsample, controller.scale, controller.frame_skip) == (1, 0.5, 1)
+    assert controller.adjustments == 3
+
+
+def test_waits_for_settle_frames_between_adjustments():
+    controller = AdaptiveController(latency_budget=0.1, settle_frames=10)
+    run(controller, 0.5, 9)
+    assert controller.adjustments == 0
+
+    run(controller, 0.5, 1)
+    assert controller.adjustments == 1
+
+
+def test_holds_steady_inside_the_band():
+    controller = AdaptiveController(latency_budget=0.1, headroom=0.6, settle_frames=1)
+    run(controller, 0.08, 20)
+
+    assert controller.adjustments == 0
+    assert controller.get_metrics()["last_decision"] == "initial"
@@ -0,0 +1,63 @@
+import numpy as np
+
+from app.recognition.ann_index import IVFIndex
+
+
+def clustered(count=2000, dim=128, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(40, dim)).astype(np.float32)
+    return centers[rng.integers(0, len(centers), count)] + rng.normal(scale=0.3, size=(count, dim)).astype(np.float32)
+
+
+def exact_neighbours(vectors, queries, k):
+    distances = np.linalg.norm(queries[:, None, :] - vectors[None, :, :], axis=2)
+    return np.argsort(distances, axis=1)[:, :k]
+
+
+def test_recall_at_default_nprobe():
+    vectors = clustered()
+    queries = vectors[:100] + np.random.default_rng(1).normal(scale=0.05, size=(100, 128)).astype(np.float32)
+    index = IVFIndex(nprobe=8)
+    index.build(vectors)
+
+    _, ids = index.search(queries, k=5)
+    truth = exact_neighbours(vectors, queries, 5)
+    recall = np.mean([len(set(found) & set(expected)) / 5 for found, expected in zip(ids, truth)])
+    assert recall >= 0.9
+
+
+def test_full_probe_is_exact():
+    vectors = clustered(count=300)
+    queries = clustered(count=10, seed=2)
+    index = IVFIndex()
+    index.build(vectors)
+
+    distances, ids = index.search(queries, k=3, nprobe=index.nlist)
+    np.testing.assert_array_equal(ids, exact_neighbours(vectors, queries, 3))
+    assert np.all(np.diff(distances, axis=1) >= 0)
+
+
+def test_add_and_padding():
+    vectors = clustered(count=50)
+    index = IVFIndex(nlist=4)
+    index.build(vectors[:2])
+    index.add(vectors[2:4], ids=[100, 101])
+
+    assert len(index) == 4
+    distances, ids = index.search(vectors[2], k=6, nprobe=4)
+    assert ids[0, 0] == 100
+    assert list(ids[0, 4:]) == [-1, -1]
+    assert np.isinf(distances[0, 4:]).all()
+
+
+def test_save_and_load(tmp_path):
+    vectors = clustered(count=200)
+    index = IVFIndex()
+    index.build(vectors)
+    index.fingerprint = "abc"
+    path = tmp_path / "index.npz"
+
+    assert index.save(path)
+    loaded = IVFIndex.load(path)
+    assert loaded.fingerprint == "abc"
+    np.testing.assert_array_equal(loaded.search(vectors[:5], k=2)[1], index.search(vectors[:5], k=2)[1])
@@ -0,0 +1,62 @@
+import numpy as np
+
+from app.recognition.gallery import FaceGallery
+
+
+def encoding(value, dim=128):
+    return np.full(dim, value, dtype=np.float32)
+
+
+def test_append_grows_past_capacity():
+    gallery = FaceGallery(capacity=2)
+    for i in range(5):
+        gallery.append("alice" if i % 2 else "bob", encoding(i))
+
+    assert len(gallery) == 5
+    assert gallery.matrix.shape == (5, 128)
+    assert gallery.matrix.dtype == np.float32
+    assert gallery.num_students == 2
+    np.testing.assert_array_equal(gallery.matrix[:, 0], [0, 1, 2, 3, 4])
+    np.testing.assert_array_equal(gallery.labels, [0, 1, 0, 1, 0])
+
+
+def test_extend_and_encodings_for():
+    gallery = FaceGallery()
+    start = gallery.extend("alice", [encoding(1), encoding(2)])
+    gallery.append("bob", encoding(3))
+
+    assert start == 0
+    np.testing.assert_array_equal(gallery.encodings_for("alice")[:, 0], [1, 2])
+    assert gallery.encodings_for("carol").shape == (0, 128)
+    assert gallery.name_of(gallery.label_for("bob")) == "bob"
+
+
+def test_remove_marks_rows_until_compaction():
+    gallery = FaceGallery.from_encodings([encoding(1), encoding(2), encoding(3)], ["alice", "bob", "alice"])
+    version = gallery.version
+
+    assert gallery.remove("alice") == 2
+    assert gallery.remove("alice") == 0
+    assert len(gallery) == 1
+    assert gallery.size == 3
+    np.testing.assert_array_equal(gallery.labels, [-1, 1, -1])
+    assert gallery.label_for("alice") is None
+    assert gallery.version > version
+
+
+def test_compact_relabels_remaining_students():
+    gallery = FaceGallery.from_encodings([encoding(1), encoding(2), encoding(3)], ["alice", "bob", "carol"])
+    gallery.remove("alice")
+    layout = gallery.layout_version
+    gallery.compact()
+
+    assert gallery.size == 2
+    assert gallery.removed_rows == 0
+    assert gallery.names == ["bob", "carol"]
+    np.testing.assert_array_equal(gallery.labels, [0, 1])
+    np.testing.assert_array_equal(gallery.matrix[:, 0], [2, 3])
+    assert gallery.layout_version == layout + 1
+
+    # Nothing to drop: the layout stays put
+    gallery.compact()
+    assert gallery.layout_version == layout + 1
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from app.recognition.gallery import FaceGallery
+from app.recognition.matcher import BatchMatcher
+
+
+def unit(index, dim=128):
+    """An encoding 1.0 away from every other unit encoding's axis"""
+    encoding = np.zeros(dim, dtype=np.float32)
+    encoding[index] = 1.0
+    return encoding
+
+
+@pytest.fixture
+def gallery():
+    # alice has two photos, bob one
+    return FaceGallery.from_encodings([unit(0), unit(1), unit(2)], ["alice", "alice", "bob"])
+
+
+def test_distance_matrix_matches_direct_norm(gallery):
+    rng = np.random.default_rng(0)
+    queries = rng.normal(size=(4, 128)).astype(np.float32)
+    matcher = BatchMatcher(gallery)
+
+    expected = np.linalg.norm(queries[:, None, :] - gallery.matrix[None, :, :], axis=2)
+    np.testing.assert_allclose(matcher.distance_matrix(queries), expected, rtol=1e-5, atol=1e-5)
+
+
+def test_match_skips_removed_rows(gallery):
+    matcher = BatchMatcher(gallery, tolerance=0.5)
+    gallery.remove("alice")
+    result = matcher.match([unit(0), unit(2)])
+
+    assert result.names == [None, "bob"]
+    assert list(result.accepted) == [False, True]
+
+
+def test_match_students_ranks_top_k(gallery):
+    gallery.append("carol", unit(3))
+    matcher = BatchMatcher(gallery, tolerance=0.5)
+    query = unit(1) * 0.9
+    result = matcher.match_students([query], k=3)
+
+    assert [gallery.name_of(label) for label in result.top_labels[0]] == ["alice", "bob", "carol"]
+    assert result.names == ["alice"]
+    assert result.top_distances[0, 0] == pytest.approx(0.1, abs=1e-5)
+    assert result.margins[0] == pytest.approx(result.top_distances[0, 1] - result.top_distances[0, 0])
+
+
+def test_match_students_rejects_near_ties(gallery):
+    # Halfway between alice and bob: within tolerance of both
+    query = (unit(0) + unit(2)) / 2
+    result = BatchMatcher(gallery, tolerance=0.8, margin=0.05).match_students([query])
+
+    assert result.top_distances[0, 0] <= 0.8
+    assert result.names == [None]
+    assert not result.accepted[0]
+
+
+def test_match_students_mean_reduction(gallery):
+    matcher = BatchMatcher(gallery, tolerance=1.0, reduce="mean")
+    student, labels = matcher.student_distances([unit(0)])
+
+    alice = list(labels).index(gallery.label_for("alice"))
+    assert student[0, alice] == pytest.approx((0.0 + np.sqrt(2)) / 2, abs=1e-5)
+
+
+def test_empty_gallery_rejects_every_face():
+    result = BatchMatcher(FaceGallery()).match_students([unit(0), unit(1)])
+
+    assert result.names == [None, None]
+    assert list(result.top_labels[:, 0]) == [-1, -1]
+
+
+def test_index_search_agrees_with_exact_scan():
+    rng = np.random.default_rng(1)
+    encodings = rng.normal(size=(400, 128)).astype(np.float32)
+    names = [f"student{i // 4}" for i in range(len(encodings))]
+    gallery = FaceGallery.from_encodings(encodings, names)
+    queries = encodings[::20] + rng.normal(scale=0.01, size=(20, 128)).astype(np.float32)
+
+    exact = BatchMatcher(gallery, tolerance=1.0).match_students(queries)
+    indexed = BatchMatcher(gallery, tolerance=1.0, ann_threshold=100, nprobe=64)
+    assert indexed.uses_index
+    result = indexed.match_students(queries)
+
+    assert result.names == exact.names
+    assert result.names == [names[i] for i in range(0, 400, 20)]
@@ -0,0 +1,75 @@
+import threading
+import time
+
+from app.recognition.pipeline import DropOldestQueue, RecognitionPipeline
+
+
+def test_queue_drops_oldest_when_full():
+    queue = DropOldestQueue(maxsize=2)
+    assert queue.put(1)
+    assert queue.put(2)
+    assert not queue.put(3)
+
+    assert queue.dropped == 1
+    assert [queue.get(0)[1] for _ in range(2)] == [2, 3]
+    assert queue.get(timeout=0.01) is None
+
+
+def test_close_wakes_waiting_consumer():
+    queue = DropOldestQueue()
+    results = []
+    consumer = threading.Thread(target=lambda: results.append(queue.get()))
+    consumer.start()
+    queue.close()
+    consumer.join(timeout=1.0)
+
+    assert not consumer.is_alive()
+    assert results == [None]
+
+
+class Item:
+    def __init__(self, seq, value, source=None):
+        self.seq = seq
+        self.timestamp = time.time()
+        self.value = value
+        self.source = source
+
+
+def run_pipeline(stages, items):
+    """Push items through a pipeline one at a time, returning what the sink saw"""
+    seen = []
+    pipeline = RecognitionPipeline(stages, seen.append)
+    pipeline.start()
+    try:
+        for handled, item in enumerate(items, 1):
+            pipeline.submit(item)
+            deadline = time.time() + 2.0
+            while pipeline.completed + pipeline.out_of_order < handled and time.time() < deadline:
+                time.sleep(0.005)
+    finally:
+        pipeline.stop()
+    return pipeline, seen
+
+
+def double(item):
+    item.value *= 2
+    return item
+
+
+def increment(item):
+    item.value += 1
+    return item
+
+
+def test_pipeline_runs_stages_in_order():
+    _, seen = run_pipeline([("double", double, 1), ("inc", increment, 1)], [Item(1, 5)])
+
+    assert [item.value for item in seen] == [11]
+
+
+def test_sink_skips_stale_frames_per_source():
+    items = [Item(2, 0, "a"), Item(1, 0, "a"), Item(1, 0, "b")]
+    pipeline, seen = run_pipeline([("noop", lambda item: item, 1)], items)
+
+    assert [(item.source, item.seq) for item in seen] == [("a", 2), ("b", 1)]
+    assert pipeline.out_of_order == 1
@@ -0,0 +1,35 @@
+import numpy as np
+
+from app.recognition.roi import detect_in_rois, expand_box, merge_windows, suppress_duplicates
+
+
+def test_expand_box_clips_to_frame():
+    assert expand_box((10, 30, 30, 10), 0.5, (100, 100)) == (0, 40, 40, 0)
+    assert expand_box((80, 95, 95, 80), 1.0, (100, 100, 3)) == (65, 100, 100, 65)
+
+
+def test_merge_windows_joins_chains_of_overlaps():
+    windows = [(0, 10, 10, 0), (5, 20, 15, 5), (12, 30, 30, 18), (50, 60, 60, 50)]
+
+    assert sorted(merge_windows(windows)) == [(0, 30, 30, 0), (50, 60, 60, 50)]
+
+
+def test_suppress_duplicates_keeps_the_larger_box():
+    boxes = [(0, 10, 10, 0), (0, 11, 11, 0), (50, 60, 60, 50)]
+
+    assert suppress_duplicates(boxes) == [(0, 11, 11, 0), (50, 60, 60, 50)]
+
+
+def test_detect_in_rois_maps_back_to_frame_coordinates():
+    frame = np.zeros((200, 200, 3), dtype=np.uint8)
+    crops = []
+
+    def detect(rgb):
+        crops.append(rgb.shape[:2])
+        height, width = rgb.shape[:2]
+        return [(height // 4, 3 * width // 4, 3 * height // 4, width // 4)]
+
+    found = detect_in_rois(frame, [(100, 140, 140, 100)], detect, scale=0.5, expand=0.5)
+
+    assert crops == [(40, 40)]  # The 80x80 window at half scale
+    assert found == [(100, 140, 140, 100)]
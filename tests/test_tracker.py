@@ -0,0 +1,148 @@
+import numpy as np
+import pytest
+
+from app.recognition.tracker import FaceTracker, box_iou
+
+
+def texture(height=120, width=160, seed=0):
+    """A blocky random image with plenty of corners to track"""
+    noise = (np.random.default_rng(seed).random((height // 2, width // 2)) * 255).astype(np.uint8)
+    return np.kron(noise, np.ones((2, 2), dtype=np.uint8))
+
+
+def test_box_iou():
+    iou = box_iou([(0, 10, 10, 0)], [(0, 10, 10, 0), (0, 15, 10, 5), (20, 30, 30, 20)])
+
+    np.testing.assert_allclose(iou, [[1.0, 50 / 150, 0.0]], rtol=1e-6)
+    assert box_iou([], [(0, 10, 10, 0)]).shape == (0, 1)
+
+
+def test_update_associates_boxes_by_iou():
+    tracker = FaceTracker()
+    first = tracker.update([(0, 50, 50, 0), (100, 150, 150, 100)], now=0.0)
+    assert [track.id for track in first] == [1, 2]
+
+    # Both faces moved a little; a third one appeared
+    created = tracker.update([(105, 155, 155, 105), (2, 52, 52, 2), (300, 350, 350, 300)], now=1.0)
+
+    assert [track.id for track in created] == [3]
+    by_id = {track.id: track for track in tracker.tracks}
+    assert by_id[1].box == (2, 52, 52, 2)
+    assert by_id[2].box == (105, 155, 155, 105)
+    assert by_id[1].last_detected == 1.0
+
+
+def test_unmatched_tracks_are_dropped_after_max_misses():
+    tracker = FaceTracker(max_misses=1)
+    tracker.update([(0, 50, 50, 0)])
+
+    tracker.update([])
+    assert len(tracker.tracks) == 1
+    assert tracker.tracks[0].misses == 1
+    tracker.update([])
+    assert tracker.tracks == []
+
+
+def test_needs_detection_every_interval():
+    tracker = FaceTracker(detect_interval=3)
+    gray = texture()
+    assert tracker.needs_detection()
+
+    tracker.update([(30, 90, 90, 30)])
+    decisions = []
+    for _ in range(3):
+        tracker.propagate(gray, 1.0)
+        decisions.append(tracker.needs_detection())
+    assert decisions == [False, False, True]
+
+
+def test_propagate_follows_flow():
+    frame = texture()
+    shifted = np.roll(frame, (3, 5), axis=(0, 1))
+
+    tracker = FaceTracker()
+    tracker.update([(30, 90, 90, 30)])
+    tracker.propagate(frame, 1.0)
+    tracker.propagate(shifted, 1.0)
+
+    track = tracker.tracks[0]
+    assert not track.lost
+    top, right, bottom, left = track.box
+    assert top == pytest.approx(33, abs=1)
+    assert left == pytest.approx(35, abs=1)
+
+
+def test_clone_keeps_settings_but_not_tracks():
+    tracker = FaceTracker(detect_interval=4, vote_window=7, votes_required=4)
+    tracker.update([(0, 50, 50, 0)])
+    clone = tracker.clone()
+
+    assert clone.tracks == []
+    assert (clone.detect_interval, clone.vote_window, clone.votes_required) == (4, 7, 4)
+
+
+def voting_track(vote_window=5, votes_required=3):
+    tracker = FaceTracker(vote_window=vote_window, votes_required=votes_required)
+    tracker.update([(0, 50, 50, 0)], now=0.0)
+    return tracker, tracker.tracks[0]
+
+
+def test_student_accepted_once_enough_votes_agree():
+    _, track = voting_track()
+    track.record_vote("alice", 0.3, True, 0.6, now=1.0)
+    track.record_vote(None, 0.7, False, 0.6, now=2.0)
+    track.record_vote("alice", 0.3, True, 0.6, now=3.0)
+    assert not track.identified
+
+    track.record_vote("alice", 0.3, True, 0.6, now=4.0)
+    assert track.accepted and track.name == "alice"
+    assert track.distance == pytest.approx(0.3)
+    assert track.confidence == pytest.approx(3 / 4 * 0.5)
+    assert track.verified_at == 4.0
+
+
+def test_single_disagreeing_vote_keeps_identity_due():
+    _, track = voting_track()
+    for t in range(3):
+        track.record_vote("alice", 0.3, True, 0.6, now=float(t))
+
+    track.record_vote("bob", 0.4, True, 0.6, now=10.0)
+    assert track.accepted and track.name == "alice"
+    assert track.verified_at == 2.0  # Not confirmed, so it is encoded again
+
+    track.record_vote("bob", 0.4, True, 0.6, now=11.0)
+    track.record_vote("bob", 0.4, True, 0.6, now=12.0)
+    assert track.name == "bob"
+
+
+def test_full_window_without_majority_is_unknown():
+    _, track = voting_track(vote_window=3, votes_required=2)
+    for t, name in enumerate(["alice", "bob", "carol"]):
+        track.record_vote(name, 0.5, True, 0.6, now=float(t))
+
+    assert track.identified and not track.accepted
+    assert track.name is None
+
+
+def test_identities_are_cached_until_reverification():
+    tracker, track = voting_track(vote_window=1, votes_required=1)
+    tracker.reverify_interval = 10.0
+
+    assert tracker.tracks_to_encode(now=0.0) == [track]
+    track.mark_pending(now=0.0)
+    assert tracker.tracks_to_encode(now=0.5) == []  # Encoding in flight
+    track.record_vote("alice", 0.3, True, 0.6, now=0.5)
+
+    assert tracker.tracks_to_encode(now=5.0) == []
+    assert tracker.tracks_to_encode(now=10.5) == [track]
+
+
+def test_lost_track_forgets_identity_when_reassociated():
+    tracker, track = voting_track(vote_window=1, votes_required=1)
+    track.record_vote("alice", 0.3, True, 0.6, now=1.0)
+    track.lost = True
+
+    tracker.update([(2, 52, 52, 2)], now=2.0)
+    assert tracker.tracks == [track]
+    assert not track.identified and track.name is None
+    assert len(track.votes) == 0